@@ -0,0 +1,81 @@
+import argparse, os, random, tempfile, time
+from datetime import datetime, timedelta, timezone
+os.environ.setdefault("KIVY_NO_ARGS", "1")  # Our flags, not Kivy's (db_initialization imports kivy)
+import db.db_initialization as db_initialization
+from db.connection import configure_journal_mode, transaction, get_connection, close_all
+from db.migrations import migrate
+from db.rollups import apply_to_rollups
+from db.time_buckets import LOCAL_TIMEZONE, bucket_keys
+from db.analytics import AnalyticsRange
+from db.exports import (write_ticket_workbook, write_tickets_csv, write_ticket_records, write_clock_logs_csv,
+                        write_clock_log_records, read_record_file)
+
+# Compare export throughput on a throwaway database:
+#   python -m benchmarks.export_benchmark --tickets 100000 --days 90  (from the repo root)
+COOKS = ((1111, "Ana"), (2222, "Ben"), (3333, "Cruz"), (4444, "Dee"))
+
+
+def seed(ticket_count, days):
+    """Fill the (temporary) database with random tickets and one shift per cook per day."""
+    now = int(time.time())
+    tickets = []
+    for _ in range(ticket_count):
+        logged_at = now - random.randint(0, days * 86400)
+        tickets.append((random.choice(COOKS)[0], logged_at, random.randint(60, 1500)))
+    tickets.sort(key=lambda ticket: ticket[1])
+
+    with transaction() as conn:
+        conn.executemany("INSERT INTO cooks (pin, name) VALUES (?, ?)", COOKS)
+        rows = [(pin, logged_at, taken) + bucket_keys(logged_at) for pin, logged_at, taken in tickets]
+        conn.executemany(
+            "INSERT INTO tickets (cook_pin, logged_at, time_taken, hour_bucket, day_bucket, week_bucket, month_bucket)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        apply_to_rollups(conn, [(row[0], row[2], row[3:]) for row in rows])
+
+        start = datetime.now(timezone.utc) - timedelta(days=days)
+        conn.executemany(
+            "INSERT INTO clock_logs (employee_name, clock_in_time, clock_out_time, status) VALUES (?, ?, ?, ?)",
+            [(name, (start + timedelta(days=day, hours=8)).isoformat(),
+              (start + timedelta(days=day, hours=16)).isoformat(), "Clocked Out")
+             for day in range(days) for _, name in COOKS])
+
+
+def run(label, writer, *args):
+    path = args[-1]
+    started = time.perf_counter()
+    rows = writer(get_connection(), *args)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(path)
+    print(f"{label:<24} {rows:>9} rows  {elapsed:8.3f} s  {rows / elapsed:>11,.0f} rows/s  {size / 1e6:8.2f} MB")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark xlsx vs CSV vs record-file exports.")
+    parser.add_argument("--tickets", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=90)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        db_initialization.db_path = os.path.join(folder, "benchmark.db")  # Never the app database
+        configure_journal_mode()
+        migrate()
+        seed(options.tickets, options.days)
+
+        now = datetime.now(LOCAL_TIMEZONE)
+        analytics_range = AnalyticsRange(now - timedelta(days=options.days), now, "day")
+        print(f"{options.tickets} tickets over {options.days} days\n")
+
+        run("tickets xlsx", write_ticket_workbook, analytics_range, "Benchmark", os.path.join(folder, "t.xlsx"))
+        run("tickets csv", write_tickets_csv, analytics_range, os.path.join(folder, "t.csv"))
+        rows = run("tickets records", write_ticket_records, analytics_range, os.path.join(folder, "t.ktr"))
+        run("clock logs csv", write_clock_logs_csv, analytics_range, os.path.join(folder, "c.csv"))
+        run("clock logs records", write_clock_log_records, analytics_range, os.path.join(folder, "c.ktr"))
+
+        # ✅ Round trip: the record file holds every exported ticket
+        assert sum(1 for _ in read_record_file(os.path.join(folder, "t.ktr"))) == rows
+        close_all()
+
+
+if __name__ == "__main__":
+    main()
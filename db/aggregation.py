@@ -0,0 +1,157 @@
+import math
+from collections import namedtuple
+from db.time_buckets import BUCKET_COLUMNS
+
+try:
+    import numpy as np
+except ImportError:  # Not bundled in every Android build; fall back to pure Python
+    np = None
+
+PERCENTILES = (50, 90, 99)
+
+# Tickets fetched per step by iter_grouped_stats
+GROUP_CHUNK_ROWS = 10000
+
+GroupStats = namedtuple(
+    "GroupStats",
+    ["bucket", "cook_pin", "count", "total", "fastest", "slowest", "mean", "std", "p50", "p90", "p99"],
+)
+
+
+def ticket_times_query(granularity, start_bucket, end_bucket=None, cook_pin=None):
+    """(sql, params) reading (bucket, cook_pin, time_taken) for a window in group order, off the covering index."""
+    column = BUCKET_COLUMNS[granularity]
+    query = f"SELECT {column}, cook_pin, time_taken FROM tickets WHERE {column} >= ?"
+    params = [start_bucket]
+    if end_bucket is not None:
+        query += f" AND {column} <= ?"
+        params.append(end_bucket)
+    if cook_pin is not None:
+        query += " AND cook_pin = ?"
+        params.append(cook_pin)
+    query += f" ORDER BY {column}, cook_pin"
+    return query, params
+
+
+def iter_grouped_stats(conn, granularity, start_bucket, end_bucket=None, cook_pin=None, chunk_size=GROUP_CHUNK_ROWS):
+    """Yield GroupStats for a window in (bucket, cook) order, reading the tickets in bounded chunks.
+
+    Rows arrive grouped, so every group but the last one in a chunk is complete;
+    those go through grouped_stats() and the tail waits for the next chunk. Memory
+    stays at about one chunk (or one period's tickets for one cook, if larger).
+    """
+    cursor = conn.execute(*ticket_times_query(granularity, start_bucket, end_bucket, cook_pin))
+    buckets, cook_pins, times = [], [], []
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for bucket, pin, time_taken in rows:
+            buckets.append(bucket)
+            cook_pins.append(pin)
+            times.append(time_taken)
+
+        # Hold back the last group, it may continue in the next chunk
+        split = len(times) - 1
+        while split > 0 and buckets[split - 1] == buckets[-1] and cook_pins[split - 1] == cook_pins[-1]:
+            split -= 1
+        if split:
+            yield from grouped_stats(buckets[:split], cook_pins[:split], times[:split])
+            del buckets[:split], cook_pins[:split], times[:split]
+
+    yield from grouped_stats(buckets, cook_pins, times)
+
+
+def grouped_stats(buckets, cook_pins, times):
+    """Group ticket times by (bucket, cook) and return a list of GroupStats sorted by bucket then cook.
+
+    Uses a sort + reduceat NumPy kernel when NumPy is available, otherwise a
+    pure-Python path with identical results (population std, linear percentiles).
+    """
+    if not times:
+        return []
+    if np is not None:
+        return _grouped_stats_numpy(buckets, cook_pins, times)
+    return _grouped_stats_python(buckets, cook_pins, times)
+
+
+def _grouped_stats_numpy(buckets, cook_pins, times):
+    # Dictionary-encode the period strings (much cheaper than np.unique on text),
+    # then remap codes so they follow chronological bucket order
+    bucket_index = {}
+    raw_codes = np.fromiter((bucket_index.setdefault(bucket, len(bucket_index)) for bucket in buckets),
+                            dtype=np.int64, count=len(buckets))
+    bucket_values = np.array(sorted(bucket_index), dtype=object)
+    rank = np.empty(len(bucket_index), dtype=np.int64)
+    rank[[bucket_index[bucket] for bucket in bucket_values]] = np.arange(len(bucket_index))
+    bucket_codes = rank[raw_codes]
+    cook_values, cook_codes = np.unique(np.asarray(cook_pins, dtype=np.int64), return_inverse=True)
+    values = np.asarray(times, dtype=np.int64)
+
+    # Pack (group, time) into one int64 so a single in-place sort orders by group, then by time
+    group_codes = bucket_codes * len(cook_values) + cook_codes
+    stride = int(values.max()) + 1
+    packed = group_codes * stride + values
+    packed.sort()
+    group_sorted = packed // stride
+    values_sorted = (packed - group_sorted * stride).astype(np.float64)
+
+    starts = np.flatnonzero(np.r_[True, group_sorted[1:] != group_sorted[:-1]])
+    ends = np.r_[starts[1:], len(values_sorted)]
+    counts = ends - starts
+
+    totals = np.add.reduceat(values_sorted, starts)
+    squares = np.add.reduceat(values_sorted * values_sorted, starts)
+    means = totals / counts
+    stds = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+    fastest = values_sorted[starts]
+    slowest = values_sorted[ends - 1]
+
+    percentiles = []
+    for pct in PERCENTILES:
+        position = (counts - 1) * (pct / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        fraction = position - lower
+        low_values = values_sorted[starts + lower]
+        high_values = values_sorted[starts + upper]
+        percentiles.append(low_values + (high_values - low_values) * fraction)
+
+    group_ids = group_sorted[starts]
+    group_buckets = bucket_values[group_ids // len(cook_values)]
+    group_cooks = cook_values[group_ids % len(cook_values)]
+
+    return [
+        GroupStats(
+            str(group_buckets[i]), int(group_cooks[i]), int(counts[i]), int(totals[i]),
+            int(fastest[i]), int(slowest[i]), float(means[i]), float(stds[i]),
+            float(percentiles[0][i]), float(percentiles[1][i]), float(percentiles[2][i]),
+        )
+        for i in range(len(starts))
+    ]
+
+
+def _percentile(sorted_values, pct):
+    position = (len(sorted_values) - 1) * (pct / 100.0)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _grouped_stats_python(buckets, cook_pins, times):
+    groups = {}
+    for bucket, cook_pin, time_taken in zip(buckets, cook_pins, times):
+        groups.setdefault((bucket, cook_pin), []).append(time_taken)
+
+    results = []
+    for (bucket, cook_pin), values in sorted(groups.items()):
+        values.sort()
+        count = len(values)
+        total = sum(values)
+        mean = total / count
+        variance = sum(value * value for value in values) / count - mean * mean
+        results.append(GroupStats(
+            bucket, cook_pin, count, total, values[0], values[-1], mean, math.sqrt(max(variance, 0.0)),
+            *(float(_percentile(values, pct)) for pct in PERCENTILES),
+        ))
+    return results
@@ -0,0 +1,133 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from db.rollups import load_rollups
+from db.aggregation import iter_grouped_stats
+from db.sketches import LogHistogram
+from db.time_buckets import LOCAL_TIMEZONE, BUCKET_COLUMNS, bucket_key, period_bounds
+
+# Default window of each preset performance view (shared by the screen and the export)
+PRESET_WINDOWS = {
+    "hour": timedelta(days=2),
+    "day": timedelta(days=7),
+    "week": timedelta(weeks=4),
+    "month": timedelta(days=90),
+}
+
+# Percentiles shown next to the min/max/average (read from the rollup sketches)
+SKETCH_PERCENTILES = (50, 90, 99)
+
+PeriodStats = namedtuple(
+    "PeriodStats",
+    ["period", "cook_pin", "cook_name", "fastest", "slowest", "total", "count", "average",
+     "p50", "p90", "p99", "sketch"],
+)
+
+
+class AnalyticsRange(namedtuple("AnalyticsRange", ["start", "end", "granularity", "cook_pin"])):
+    """A performance query: aware local start/end datetimes, a granularity and an optional cook.
+
+    Rollups are stored per local period, so the range covers every whole period
+    from the one containing `start` to the one containing `end`.
+    """
+    __slots__ = ()
+
+    def __new__(cls, start, end, granularity, cook_pin=None):
+        if granularity not in BUCKET_COLUMNS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        if end < start:
+            raise ValueError("Range end is before its start")
+        return super().__new__(cls, start, end, granularity, cook_pin)
+
+    @property
+    def start_bucket(self):
+        return bucket_key(self.start, self.granularity)
+
+    @property
+    def end_bucket(self):
+        return bucket_key(self.end, self.granularity)
+
+    @property
+    def cache_key(self):
+        """Period-level identity of the range (two ranges in the same periods share results)."""
+        return (self.granularity, self.start_bucket, self.end_bucket, self.cook_pin, LOCAL_TIMEZONE.zone)
+
+    @property
+    def epoch_bounds(self):
+        """(first, last + 1) UTC epoch seconds of the whole periods covered, for tickets.logged_at scans."""
+        start, _ = period_bounds(self.start, self.granularity)
+        _, end = period_bounds(self.end, self.granularity)
+        return int(start.timestamp()), int(end.timestamp())
+
+
+def preset_range(granularity, now=None):
+    """The preset window for a view, ending now."""
+    now = now or datetime.now(LOCAL_TIMEZONE)
+    return AnalyticsRange(now - PRESET_WINDOWS[granularity], now, granularity)
+
+
+def sketch_percentiles(sketch, fastest, slowest):
+    """(p50, p90, p99) whole seconds from a sketch, kept within the exact min/max (None if no sketch)."""
+    values = []
+    for percentile in SKETCH_PERCENTILES:
+        value = sketch.quantile(percentile / 100)
+        values.append(None if value is None else min(max(int(round(value)), fastest), slowest))
+    return tuple(values)
+
+
+def period_stats(conn, analytics_range):
+    """Return PeriodStats rows for a range, ordered by period then fastest average (filtered and sorted in SQL)."""
+    rows = load_rollups(conn, analytics_range.granularity, analytics_range.start_bucket,
+                        analytics_range.end_bucket, analytics_range.cook_pin)
+    stats = []
+    for row in rows:
+        sketch = LogHistogram.from_bytes(row[8])
+        stats.append(PeriodStats(*row[:8], *sketch_percentiles(sketch, row[3], row[4]), sketch))
+    return stats
+
+
+def stats_by_period(conn, analytics_range):
+    """period_stats grouped as {period: [PeriodStats, ...]} in period order."""
+    data_by_period = {}
+    for stats in period_stats(conn, analytics_range):
+        data_by_period.setdefault(stats.period, []).append(stats)
+    return data_by_period
+
+
+def range_totals(data_by_period):
+    """One PeriodStats per cook over every period of a view (period=None), fastest average first.
+
+    Built from already loaded rows by merging their sketches, so percentiles for
+    any range come without another query or a raw ticket scan.
+    """
+    totals = {}
+    for records in data_by_period.values():
+        for stats in records:
+            total = totals.get(stats.cook_pin)
+            if total is None:
+                totals[stats.cook_pin] = [stats.cook_name, stats.fastest, stats.slowest, stats.total, stats.count,
+                                          LogHistogram().merge(stats.sketch)]
+            else:
+                total[1] = min(total[1], stats.fastest)
+                total[2] = max(total[2], stats.slowest)
+                total[3] += stats.total
+                total[4] += stats.count
+                total[5].merge(stats.sketch)
+
+    rows = [
+        PeriodStats(None, cook_pin, name, fastest, slowest, total, count, total // count,
+                    *sketch_percentiles(sketch, fastest, slowest), sketch)
+        for cook_pin, (name, fastest, slowest, total, count, sketch) in totals.items()
+    ]
+    rows.sort(key=lambda stats: (stats.average, stats.cook_name))
+    return rows
+
+
+def spread_stats(conn, analytics_range):
+    """Return {(period, cook_pin): GroupStats} (exact median, percentiles, std dev) from the raw tickets in a range.
+
+    The tickets are streamed in chunks, so memory follows the number of
+    (period, cook) groups rather than the number of tickets.
+    """
+    groups = iter_grouped_stats(conn, analytics_range.granularity, analytics_range.start_bucket,
+                                analytics_range.end_bucket, analytics_range.cook_pin)
+    return {(stats.bucket, stats.cook_pin): stats for stats in groups}
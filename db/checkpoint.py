@@ -0,0 +1,59 @@
+import sqlite3, threading, time
+from db.connection import get_connection, get_journal_mode, last_write_time, close_connection
+
+
+class CheckpointScheduler:
+    """Background thread that folds the WAL back into the database while the kitchen is idle.
+
+    A PASSIVE checkpoint never blocks readers or writers, so running it off the
+    UI thread keeps Order Out fast. It only fires once no ticket or clock log
+    has been written for `idle_after` seconds, and only if something was
+    written since the previous checkpoint.
+    """
+
+    def __init__(self, interval=15, idle_after=20):
+        self.interval = interval
+        self.idle_after = idle_after
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_checkpoint = 0.0
+
+    def start(self):
+        """Start the checkpoint thread (no-op when WAL isn't in use)."""
+        if get_journal_mode() != "wal" or self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and wait briefly for it to finish."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            if self._is_idle():
+                self.checkpoint()
+        close_connection()
+
+    def _is_idle(self):
+        last_write = last_write_time()
+        if last_write <= self._last_checkpoint:
+            return False  # Nothing new in the WAL
+        return time.monotonic() - last_write >= self.idle_after
+
+    def checkpoint(self):
+        """Run a PASSIVE checkpoint; returns (busy, wal_pages, checkpointed_pages) or None."""
+        try:
+            result = get_connection().execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        except sqlite3.Error as e:
+            print(f"WAL checkpoint failed: {e}")
+            return None
+
+        self._last_checkpoint = time.monotonic()
+        return result
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+# Rows per "older" page fetched while scrolling
+PAGE_SIZE = 50
+# The first page always covers at least this many recent days
+INITIAL_DAYS = 7
+
+_COLUMNS = "id, employee_name, clock_in_time, clock_out_time, status"
+
+# Paging, newest first, walking idx_clock_logs_in_time
+RECENT_LOGS_SQL = f'''
+    SELECT {_COLUMNS} FROM clock_logs
+    WHERE clock_in_time >= ?
+    ORDER BY clock_in_time DESC, id DESC
+'''
+NEWEST_PAGE_SQL = f'''
+    SELECT {_COLUMNS} FROM clock_logs
+    ORDER BY clock_in_time DESC, id DESC
+    LIMIT ?
+'''
+# Row-value comparison walks the index backwards from the cursor
+PAGE_BEFORE_SQL = f'''
+    SELECT {_COLUMNS} FROM clock_logs
+    WHERE (clock_in_time, id) < (?, ?)
+    ORDER BY clock_in_time DESC, id DESC
+    LIMIT ?
+'''
+
+# Open shifts, off the partial indexes on clock_out_time IS NULL
+LATEST_OPEN_SHIFT_SQL = '''
+    SELECT employee_name FROM clock_logs
+    WHERE clock_out_time IS NULL
+    ORDER BY clock_in_time DESC LIMIT 1
+'''
+OPEN_SHIFT_FOR_COOK_SQL = '''
+    SELECT id FROM clock_logs
+    WHERE employee_name = ? AND clock_out_time IS NULL
+    ORDER BY clock_in_time DESC LIMIT 1
+'''
+
+
+def fetch_first_page(conn, days=INITIAL_DAYS, min_rows=PAGE_SIZE):
+    """Return the most recent clock logs: everything from the last `days` days,
+    topped up with older rows so a quiet week still fills the screen.
+
+    Rows are (id, employee_name, clock_in_time, clock_out_time, status), newest first.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    rows = conn.execute(RECENT_LOGS_SQL, (cutoff,)).fetchall()
+
+    if len(rows) < min_rows:
+        rows += fetch_page_before(conn, page_cursor(rows), min_rows - len(rows))
+    return rows
+
+
+def fetch_page_before(conn, cursor, limit=PAGE_SIZE):
+    """Return up to `limit` logs strictly older than a (clock_in_time, id) cursor (None = newest)."""
+    if cursor is None:
+        return conn.execute(NEWEST_PAGE_SQL, (limit,)).fetchall()
+    return conn.execute(PAGE_BEFORE_SQL, (cursor[0], cursor[1], limit)).fetchall()
+
+
+def page_cursor(rows):
+    """Return the keyset cursor for the last (oldest) row of a page, or None if empty."""
+    if not rows:
+        return None
+    last = rows[-1]
+    return last[2], last[0]
@@ -0,0 +1,162 @@
+import sqlite3, threading, time
+from contextlib import contextmanager
+from db.sketches import merge_sketch_blobs
+
+# Pragmas applied once when a thread opens its connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-4000",  # ~4 MB page cache per connection
+)
+
+# Number of prepared statements sqlite3 keeps per connection
+STATEMENT_CACHE_SIZE = 128
+
+# Try write-ahead logging first; fall back to a rollback journal if storage can't do WAL
+PREFERRED_JOURNAL_MODE = "wal"
+FALLBACK_JOURNAL_MODE = "delete"
+
+# Let the idle checkpointer do most of the work; this is only a safety cap (pages)
+WAL_AUTOCHECKPOINT_PAGES = 4000
+
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+_generation = 0  # Bumped by close_all() so other threads reopen
+_journal_mode = None  # Set once by configure_journal_mode()
+_last_write = 0.0  # time.monotonic() of the last transaction that changed rows
+
+
+def _default_db_path():
+    """Resolve the app database path lazily to avoid a circular import."""
+    from db.db_initialization import db_path
+    return db_path
+
+
+def get_connection():
+    """Return this thread's shared connection, opening it on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.generation == _generation:
+        return conn
+
+    # isolation_level=None keeps reads in autocommit; writes go through transaction()
+    conn = sqlite3.connect(
+        _default_db_path(),
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    _apply_sync_pragmas(conn)
+    # Lets the rollup upsert merge percentile sketches in place (see db/rollups.py)
+    conn.create_function("sketch_merge", 2, merge_sketch_blobs, deterministic=True)
+
+    _local.conn = conn
+    _local.generation = _generation
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+
+def _apply_sync_pragmas(conn):
+    """Match synchronous to the journal mode (it is a per-connection setting)."""
+    if _journal_mode == "wal":
+        # WAL only needs to fsync at checkpoints; commits stay durable across app crashes
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA wal_autocheckpoint={WAL_AUTOCHECKPOINT_PAGES}")
+    else:
+        conn.execute("PRAGMA synchronous=FULL")
+
+
+def configure_journal_mode():
+    """Switch the database to WAL, or fall back to a rollback journal if unsupported.
+
+    Some Android storage (FUSE/SD card mounts) cannot provide the shared memory
+    file WAL needs, which shows up either as the pragma refusing the change or
+    as an I/O error on the first read afterwards.
+    """
+    global _journal_mode
+    conn = get_connection()
+
+    try:
+        mode = conn.execute(f"PRAGMA journal_mode={PREFERRED_JOURNAL_MODE}").fetchone()[0]
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()  # Probe the -shm file
+    except sqlite3.OperationalError as e:
+        print(f"WAL unavailable on this storage ({e}), using {FALLBACK_JOURNAL_MODE} journal.")
+        mode = None
+
+    if mode != PREFERRED_JOURNAL_MODE:
+        mode = conn.execute(f"PRAGMA journal_mode={FALLBACK_JOURNAL_MODE}").fetchone()[0]
+
+    _journal_mode = mode.lower()
+    with _connections_lock:
+        connections = list(_connections)
+    for open_conn in connections:
+        _apply_sync_pragmas(open_conn)
+
+    print(f"Database journal mode: {_journal_mode}")
+    return _journal_mode
+
+
+def get_journal_mode():
+    """Return the journal mode chosen by configure_journal_mode() (None before init)."""
+    return _journal_mode
+
+
+def last_write_time():
+    """Return the time.monotonic() timestamp of the last committed transaction that changed rows."""
+    return _last_write
+
+
+@contextmanager
+def transaction(immediate=False):
+    """Run a block inside a single transaction on this thread's connection.
+
+    Commits on success and rolls back on any exception. Nested calls join
+    the outer transaction instead of starting a new one.
+    """
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+
+    global _last_write
+    changes = conn.total_changes
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+        if conn.total_changes != changes:  # Read-only snapshots don't count as writes
+            _last_write = time.monotonic()
+
+
+def close_connection():
+    """Close the calling thread's connection if it has one."""
+    conn = getattr(_local, "conn", None)
+    _local.conn = None
+    if conn is None:
+        return
+    with _connections_lock:
+        if conn in _connections:
+            _connections.remove(conn)
+    conn.close()
+
+
+def close_all():
+    """Close every connection handed out so far (used on app shutdown)."""
+    global _generation
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            pass
+    _local.conn = None
@@ -1,6 +1,8 @@
-import sqlite3, os, shutil, pytz
+import os, shutil, pytz
 from kivy.utils import platform
 from datetime import datetime
+from db.connection import configure_journal_mode
+from db.migrations import migrate
 
 if platform == "android":
     from jnius import autoclass
@@ -35,42 +37,8 @@ def init_database():
     if not os.path.exists(db_folder):
         os.makedirs(db_folder, exist_ok=True)
 
-    # ✅ Connect to the SQLite database file in the new location
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # ✅ Disable WAL mode to prevent locks
-    cursor.execute("PRAGMA journal_mode=DELETE;")
-
-    # ✅ Create tables if they don't exist
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS cooks (
-            pin INTEGER PRIMARY KEY,
-            name TEXT NOT NULL
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS clock_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            employee_name TEXT NOT NULL,
-            clock_in_time TEXT NOT NULL,
-            clock_out_time TEXT,
-            status TEXT
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tickets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            cook_pin INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            time_taken INTEGER NOT NULL,
-            FOREIGN KEY (cook_pin) REFERENCES cooks (pin)
-        )
-    ''')
-
-    # ✅ Commit and close connection
-    conn.commit()
-    conn.close()
+    # ✅ Use WAL so report reads never block ticket writes (falls back on unsupported storage)
+    configure_journal_mode()
 
+    # ✅ Create tables and indexes, upgrading older databases in place
+    migrate()
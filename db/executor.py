@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asynckivy
+from kivy.clock import Clock
+from db.connection import get_connection
+
+
+class QueryTask:
+    """Handle for one submitted query; once cancelled its callbacks never run."""
+    __slots__ = ("future", "owner", "cancelled")
+
+    def __init__(self, owner=None):
+        self.future = None
+        self.owner = owner
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()  # Drops it if a worker hasn't picked it up yet
+
+
+class DBExecutor:
+    """Small thread pool that keeps SQL (and file exports) off the Kivy main thread.
+
+    Work is a function taking the worker thread's own connection first:
+    fn(conn, *args). Use submit() with callbacks, which are delivered on the
+    Kivy thread through Clock.schedule_once, or `await run(...)` inside an
+    asynckivy task. Screens pass themselves as `owner` and call
+    cancel_all(self) from on_leave so late results never land on a screen
+    that's gone.
+    """
+
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._pool = None
+        self._tasks = {}  # owner -> set of pending QueryTasks
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db-query")
+        return self._pool
+
+    @staticmethod
+    def _call(fn, args):
+        return fn(get_connection(), *args)
+
+    def submit(self, fn, *args, on_result=None, on_error=None, owner=None):
+        """Run fn(conn, *args) on a worker; on_result(value) / on_error(exc) run on the Kivy thread."""
+        task = QueryTask(owner)
+        if owner is not None:
+            self._tasks.setdefault(owner, set()).add(task)
+        task.future = self.pool.submit(self._call, fn, args)
+        task.future.add_done_callback(
+            lambda future: Clock.schedule_once(lambda dt: self._deliver(task, on_result, on_error)))
+        return task
+
+    def _deliver(self, task, on_result, on_error):
+        pending = self._tasks.get(task.owner)
+        if pending is not None:
+            pending.discard(task)
+            if not pending:
+                del self._tasks[task.owner]
+        if task.cancelled or task.future.cancelled():
+            return  # Cancelled by its owner, or dropped by shutdown() before it ran
+
+        error = task.future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                print(f"Background query failed: {error}")
+        elif on_result is not None:
+            on_result(task.future.result())
+
+    async def run(self, fn, *args):
+        """Awaitable form for asynckivy tasks: rows = await db_executor.run(fn, *args)."""
+        return await asynckivy.run_in_executor(self.pool, partial(self._call, fn, args))
+
+    def cancel_all(self, owner):
+        """Cancel everything an owner (usually a screen) still has in flight."""
+        for task in self._tasks.pop(owner, ()):
+            task.cancel()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# ✅ Shared executor for screen queries and exports
+db_executor = DBExecutor()
@@ -0,0 +1,287 @@
+import csv, struct
+import openpyxl
+from datetime import datetime, timezone
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from db.analytics import spread_stats
+from db.time_buckets import LOCAL_TIMEZONE
+
+# Rows pulled from the cursor (and handed to the writer) per step; memory stays at one chunk
+EXPORT_CHUNK_ROWS = 1000
+
+PERFORMANCE_HEADERS = ("Period", "Cook", "Shortest", "Longest", "Average", "Tickets", "Median", "90th Pct", "99th Pct",
+                       "Std Dev")
+TICKET_HEADERS = ("Ticket", "Cook", "PIN", "Logged At (Local)", "Time Taken", "Seconds")
+CLOCK_LOG_HEADERS = ("Log", "Employee", "Clock In (Local)", "Clock Out (Local)", "Status")
+EXPORT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Record files (.ktr): fixed-width little-endian records for back-office ingestion,
+# readable with read_record_file() or numpy.fromfile(path, dtype, offset=RECORD_HEADER.size)
+#
+#   header   RECORD_HEADER "<4sHHQ": magic, version, record size, record count
+#   tickets  b"KTTK", TICKET_RECORD "<qqqi" (28 bytes):
+#            id, cook_pin, logged_at (UTC epoch s), time_taken (s)
+#            numpy dtype [("id", "<i8"), ("cook_pin", "<i8"), ("logged_at", "<i8"), ("time_taken", "<i4")]
+#   clock    b"KTCL", CLOCK_LOG_RECORD "<qqq32s16s" (72 bytes):
+#            id, clock_in, clock_out (UTC epoch s, -1 while still clocked in),
+#            employee_name, status (UTF-8, NUL padded, cut to fit)
+#            numpy dtype [("id", "<i8"), ("clock_in", "<i8"), ("clock_out", "<i8"),
+#                         ("employee_name", "S32"), ("status", "S16")]
+RECORD_VERSION = 1
+RECORD_HEADER = struct.Struct("<4sHHQ")
+TICKET_RECORD = struct.Struct("<qqqi")
+CLOCK_LOG_RECORD = struct.Struct("<qqq32s16s")
+TICKET_MAGIC = b"KTTK"
+CLOCK_LOG_MAGIC = b"KTCL"
+RECORD_FORMATS = {TICKET_MAGIC: TICKET_RECORD, CLOCK_LOG_MAGIC: CLOCK_LOG_RECORD}
+
+
+def format_time(seconds):
+    """Convert seconds to minute:seconds format."""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def ticket_filter(analytics_range):
+    """WHERE clause and params for the raw tickets of a range (a logged_at index scan, already in time order)."""
+    start, end = analytics_range.epoch_bounds
+    clause = "t.logged_at >= ? AND t.logged_at < ?"
+    params = [start, end]
+    if analytics_range.cook_pin is not None:
+        clause = "t.cook_pin = ? AND " + clause  # idx_tickets_cook_logged_at
+        params.insert(0, analytics_range.cook_pin)
+    return clause, params
+
+
+def count_tickets(conn, analytics_range):
+    clause, params = ticket_filter(analytics_range)
+    return conn.execute(f"SELECT COUNT(*) FROM tickets t WHERE {clause}", params).fetchone()[0]
+
+
+def iter_ticket_chunks(conn, analytics_range, chunk_size=EXPORT_CHUNK_ROWS):
+    """Yield lists of (id, cook_name, cook_pin, logged_at, time_taken) in logged_at order, chunk_size rows at a time."""
+    clause, params = ticket_filter(analytics_range)
+    cursor = conn.execute(f"""
+        SELECT t.id, cooks.name, t.cook_pin, t.logged_at, t.time_taken
+        FROM tickets t
+        LEFT JOIN cooks ON cooks.pin = t.cook_pin
+        WHERE {clause}
+        ORDER BY t.logged_at
+    """, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def clock_log_filter(analytics_range):
+    """WHERE clause and params for the clock logs that started in a range (clock_in_time is UTC ISO text)."""
+    start, end = (datetime.fromtimestamp(epoch, timezone.utc).isoformat() for epoch in analytics_range.epoch_bounds)
+    clause = "clock_in_time >= ? AND clock_in_time < ?"
+    params = [start, end]
+    if analytics_range.cook_pin is not None:
+        clause += " AND employee_name = (SELECT name FROM cooks WHERE pin = ?)"
+        params.append(analytics_range.cook_pin)
+    return clause, params
+
+
+def count_clock_logs(conn, analytics_range):
+    clause, params = clock_log_filter(analytics_range)
+    return conn.execute(f"SELECT COUNT(*) FROM clock_logs WHERE {clause}", params).fetchone()[0]
+
+
+def iter_clock_log_chunks(conn, analytics_range, chunk_size=EXPORT_CHUNK_ROWS):
+    """Yield lists of (id, employee_name, clock_in_time, clock_out_time, status) in clock-in order."""
+    clause, params = clock_log_filter(analytics_range)
+    cursor = conn.execute(f"""
+        SELECT id, employee_name, clock_in_time, clock_out_time, status
+        FROM clock_logs
+        WHERE {clause}
+        ORDER BY clock_in_time, id
+    """, params)  # idx_clock_logs_in_time
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def local_timestamp(epoch_seconds):
+    return datetime.fromtimestamp(epoch_seconds, LOCAL_TIMEZONE).strftime(EXPORT_DATE_FORMAT)
+
+
+def local_iso_timestamp(iso_string):
+    """UTC ISO text from clock_logs as a local timestamp ("" for a missing clock-out)."""
+    if not iso_string:
+        return ""
+    return datetime.fromisoformat(iso_string).astimezone(LOCAL_TIMEZONE).strftime(EXPORT_DATE_FORMAT)
+
+
+def iso_to_epoch(iso_string):
+    return int(datetime.fromisoformat(iso_string).timestamp()) if iso_string else -1
+
+
+def _fixed_text(value, size):
+    """UTF-8 bytes cut to `size` without splitting a character (struct pads with NULs)."""
+    return (value or "").encode("utf-8")[:size].decode("utf-8", "ignore").encode("utf-8")
+
+
+def _write_only_sheet(title, heading, headers, widths):
+    """A streaming (write_only) workbook whose single sheet starts with a bold title and header row."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    for column, width in zip("ABCDEFGHIJ", widths):
+        ws.column_dimensions[column].width = width
+    ws.freeze_panes = "A3"  # Keep the title and headers in view
+
+    title_cell = WriteOnlyCell(ws, value=heading)
+    title_cell.font = Font(bold=True, size=16)
+    ws.append([title_cell])
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
+    return wb, ws
+
+
+def write_performance_workbook(conn, filtered_data, analytics_range, title, save_path, progress=None):
+    """Stream the per-period summary on screen (plus spread stats) into an xlsx file.
+
+    Runs on a DB worker thread. progress(done, total), if given, is called
+    from that thread after each period.
+    """
+    # ✅ Exact spread stats (median, 90th/99th percentile, std dev) for the same range as the rows,
+    # streamed off the covering index so memory follows the number of rows written, not tickets
+    spread_by_cook = spread_stats(conn, analytics_range)
+
+    wb, ws = _write_only_sheet("Performance Data", title, PERFORMANCE_HEADERS, (16, 20, 10, 10, 10, 9, 10, 10, 10, 10))
+    total, done = sum(len(records) for records in filtered_data.values()), 0
+    for period, records in filtered_data.items():
+        for record in records:
+            spread = spread_by_cook.get((period, record.cook_pin))
+            ws.append([
+                period,
+                record.cook_name,
+                format_time(record.fastest),
+                format_time(record.slowest),
+                format_time(int(record.average)),
+                record.count,
+                format_time(int(spread.p50)) if spread else "",
+                format_time(int(spread.p90)) if spread else "",
+                format_time(int(spread.p99)) if spread else "",
+                format_time(int(spread.std)) if spread else "",
+            ])
+        done += len(records)
+        if progress is not None:
+            progress(done, total)
+
+    wb.save(save_path)
+    return done
+
+
+def write_ticket_workbook(conn, analytics_range, title, save_path, progress=None):
+    """Stream every raw ticket of a range from the cursor into an xlsx file, one chunk in memory at a time.
+
+    Runs on a DB worker thread. progress(done, total), if given, is called
+    from that thread after each chunk.
+    """
+    total, done = count_tickets(conn, analytics_range), 0
+    wb, ws = _write_only_sheet("Tickets", title, TICKET_HEADERS, (10, 20, 8, 20, 11, 9))
+    for rows in iter_ticket_chunks(conn, analytics_range):
+        for ticket_id, cook_name, cook_pin, logged_at, time_taken in rows:
+            ws.append([ticket_id, cook_name or "", cook_pin, local_timestamp(logged_at),
+                       format_time(time_taken), time_taken])
+        done += len(rows)
+        if progress is not None:
+            progress(done, total)
+
+    wb.save(save_path)
+    return done
+
+
+def _write_csv(save_path, headers, chunks, total, convert, progress):
+    done = 0
+    with open(save_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for rows in chunks:
+            writer.writerows(map(convert, rows))
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+    return done
+
+
+def write_tickets_csv(conn, analytics_range, save_path, progress=None):
+    """Stream the raw tickets of a range into a CSV file."""
+    return _write_csv(
+        save_path, TICKET_HEADERS, iter_ticket_chunks(conn, analytics_range), count_tickets(conn, analytics_range),
+        lambda row: (row[0], row[1] or "", row[2], local_timestamp(row[3]), format_time(row[4]), row[4]),
+        progress)
+
+
+def write_clock_logs_csv(conn, analytics_range, save_path, progress=None):
+    """Stream the clock logs of a range into a CSV file."""
+    return _write_csv(
+        save_path, CLOCK_LOG_HEADERS, iter_clock_log_chunks(conn, analytics_range),
+        count_clock_logs(conn, analytics_range),
+        lambda row: (row[0], row[1], local_iso_timestamp(row[2]), local_iso_timestamp(row[3]), row[4] or ""),
+        progress)
+
+
+def _write_records(save_path, magic, record, chunks, total, pack, progress):
+    """Write a record file: header, then one packed record per row; the count is patched in at the end."""
+    done = 0
+    with open(save_path, "wb") as f:
+        f.write(RECORD_HEADER.pack(magic, RECORD_VERSION, record.size, 0))
+        for rows in chunks:
+            f.write(b"".join(pack(row) for row in rows))
+            done += len(rows)
+            if progress is not None:
+                progress(done, total)
+        f.seek(0)
+        f.write(RECORD_HEADER.pack(magic, RECORD_VERSION, record.size, done))
+    return done
+
+
+def write_ticket_records(conn, analytics_range, save_path, progress=None):
+    """Stream the raw tickets of a range into a fixed-width record file (format above RECORD_VERSION)."""
+    return _write_records(
+        save_path, TICKET_MAGIC, TICKET_RECORD, iter_ticket_chunks(conn, analytics_range),
+        count_tickets(conn, analytics_range),
+        lambda row: TICKET_RECORD.pack(row[0], row[2], row[3], row[4]),
+        progress)
+
+
+def write_clock_log_records(conn, analytics_range, save_path, progress=None):
+    """Stream the clock logs of a range into a fixed-width record file (format above RECORD_VERSION)."""
+    return _write_records(
+        save_path, CLOCK_LOG_MAGIC, CLOCK_LOG_RECORD, iter_clock_log_chunks(conn, analytics_range),
+        count_clock_logs(conn, analytics_range),
+        lambda row: CLOCK_LOG_RECORD.pack(row[0], iso_to_epoch(row[2]), iso_to_epoch(row[3]),
+                                          _fixed_text(row[1], 32), _fixed_text(row[4], 16)),
+        progress)
+
+
+def read_record_file(path):
+    """Yield the records of a .ktr file as tuples (text fields decoded, NUL padding stripped)."""
+    with open(path, "rb") as f:
+        magic, version, size, count = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+        record = RECORD_FORMATS.get(magic)
+        if record is None or version != RECORD_VERSION or size != record.size:
+            raise ValueError(f"Unsupported record file: {magic!r} v{version}")
+        remaining = count
+        while remaining:
+            batch = min(remaining, EXPORT_CHUNK_ROWS)
+            for values in record.iter_unpack(f.read(batch * size)):
+                yield tuple(v.rstrip(b"\0").decode("utf-8") if isinstance(v, bytes) else v for v in values)
+            remaining -= batch
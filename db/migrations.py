@@ -0,0 +1,223 @@
+from db.connection import get_connection, transaction
+from db.rollups import create_rollup_table, add_rollup_sketches
+from db.time_buckets import bucket_keys, legacy_date_to_epoch
+
+# Rows converted per chunk while backfilling tickets
+BACKFILL_CHUNK_SIZE = 5000
+
+
+# The backfills below are snapshots of the rollup code as it stood when each
+# migration shipped, so replaying an old upgrade never depends on today's
+# db/rollups.py (which also maintains later columns such as the sketches).
+
+def backfill_rollups_v5(conn):
+    """Fill ticket_rollups from the text-dated tickets table of schema v4."""
+    conn.execute("DELETE FROM ticket_rollups")
+    groups = {}
+    cursor = conn.execute("SELECT cook_pin, date, time_taken FROM tickets")
+    while True:
+        rows = cursor.fetchmany(BACKFILL_CHUNK_SIZE)
+        if not rows:
+            break
+        for cook_pin, utc_date, time_taken in rows:
+            buckets = bucket_keys(legacy_date_to_epoch(utc_date))
+            for granularity, bucket in zip(("hour", "day", "week", "month"), buckets):
+                group = groups.get((granularity, bucket, cook_pin))
+                if group is None:
+                    groups[(granularity, bucket, cook_pin)] = [1, time_taken, time_taken, time_taken,
+                                                               time_taken * time_taken]
+                else:
+                    group[0] += 1
+                    group[1] += time_taken
+                    group[2] = min(group[2], time_taken)
+                    group[3] = max(group[3], time_taken)
+                    group[4] += time_taken * time_taken
+
+    conn.executemany('''
+        INSERT INTO ticket_rollups
+            (granularity, bucket, cook_pin, ticket_count, total_time, min_time, max_time, sum_squares)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [key + tuple(values) for key, values in groups.items()])
+
+
+def rebuild_rollups_v6(conn):
+    """Recompute ticket_rollups from the v6 bucket columns, grouped in SQL."""
+    conn.execute("DELETE FROM ticket_rollups")
+    for granularity in ("hour", "day", "week", "month"):
+        conn.execute(f'''
+            INSERT INTO ticket_rollups
+                (granularity, bucket, cook_pin, ticket_count, total_time, min_time, max_time, sum_squares)
+            SELECT ?, {granularity}_bucket, cook_pin, COUNT(*), SUM(time_taken), MIN(time_taken),
+                   MAX(time_taken), SUM(time_taken * time_taken)
+            FROM tickets
+            GROUP BY {granularity}_bucket, cook_pin
+        ''', (granularity,))
+
+
+def migrate_tickets_to_epoch(conn):
+    """Rebuild tickets with an integer epoch column and precomputed local bucket columns."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(tickets)")]
+    if "logged_at" in columns:
+        return  # Already converted
+
+    conn.execute("DROP TABLE IF EXISTS tickets_v6")
+    conn.execute('''
+        CREATE TABLE tickets_v6 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cook_pin INTEGER NOT NULL,
+            logged_at INTEGER NOT NULL,  -- UTC epoch seconds at Order Out
+            time_taken INTEGER NOT NULL,
+            hour_bucket TEXT NOT NULL,  -- Local period keys, see db/time_buckets.py
+            day_bucket TEXT NOT NULL,
+            week_bucket TEXT NOT NULL,
+            month_bucket TEXT NOT NULL,
+            FOREIGN KEY (cook_pin) REFERENCES cooks (pin)
+        )
+    ''')
+
+    # Backfill existing text-dated rows, keeping their ids
+    cursor = conn.execute("SELECT id, cook_pin, date, time_taken FROM tickets ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(BACKFILL_CHUNK_SIZE)
+        if not rows:
+            break
+        converted = []
+        for ticket_id, cook_pin, utc_date, time_taken in rows:
+            logged_at = legacy_date_to_epoch(utc_date)
+            converted.append((ticket_id, cook_pin, logged_at, time_taken) + bucket_keys(logged_at))
+        conn.executemany('''
+            INSERT INTO tickets_v6
+                (id, cook_pin, logged_at, time_taken, hour_bucket, day_bucket, week_bucket, month_bucket)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', converted)
+
+    conn.execute("DROP TABLE tickets")  # Also drops the old date indexes
+    conn.execute("ALTER TABLE tickets_v6 RENAME TO tickets")
+
+# Ordered schema migrations: (version, description, statements).
+# Every statement must be idempotent so a half-applied upgrade can be re-run.
+MIGRATIONS = [
+    (1, "base tables", (
+        '''
+        CREATE TABLE IF NOT EXISTS cooks (
+            pin INTEGER PRIMARY KEY,
+            name TEXT NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS clock_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            employee_name TEXT NOT NULL,
+            clock_in_time TEXT NOT NULL,
+            clock_out_time TEXT,
+            status TEXT
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS tickets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            cook_pin INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            time_taken INTEGER NOT NULL,
+            FOREIGN KEY (cook_pin) REFERENCES cooks (pin)
+        )
+        ''',
+    )),
+    (2, "indexes for ticket stats and performance ranges", (
+        # KitchenPanel.update_stats: one cook, one day range
+        "CREATE INDEX IF NOT EXISTS idx_tickets_cook_date ON tickets (cook_pin, date)",
+        # PerformanceMenuScreen.load_performance_data: date >= ? ORDER BY date
+        "CREATE INDEX IF NOT EXISTS idx_tickets_date ON tickets (date)",
+        # Name -> PIN lookups in update_stats and restore_logged_in_user
+        "CREATE INDEX IF NOT EXISTS idx_cooks_name ON cooks (name)",
+    )),
+    (3, "partial indexes for open clock logs", (
+        # TicketApp.restore_logged_in_user / auto_clock_out: latest open shift
+        '''
+        CREATE INDEX IF NOT EXISTS idx_clock_logs_open
+        ON clock_logs (clock_in_time) WHERE clock_out_time IS NULL
+        ''',
+        # KitchenPanel.log_clock_out / auto_logout_user: open shift for one cook
+        '''
+        CREATE INDEX IF NOT EXISTS idx_clock_logs_open_by_name
+        ON clock_logs (employee_name, clock_in_time) WHERE clock_out_time IS NULL
+        ''',
+    )),
+    (4, "write-behind journal bookkeeping", (
+        # Highest spill-file sequence number already inserted, per journal
+        '''
+        CREATE TABLE IF NOT EXISTS journal_state (
+            name TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL
+        )
+        ''',
+    )),
+    (5, "pre-aggregated performance rollups", (
+        create_rollup_table,
+        backfill_rollups_v5,  # Backfill from existing tickets
+    )),
+    (6, "epoch ticket timestamps with local bucket columns", (
+        migrate_tickets_to_epoch,
+        # KitchenPanel header / stats cache: one cook, one business-day range
+        "CREATE INDEX IF NOT EXISTS idx_tickets_cook_logged_at ON tickets (cook_pin, logged_at)",
+        # Raw time-range scans
+        "CREATE INDEX IF NOT EXISTS idx_tickets_logged_at ON tickets (logged_at)",
+        # Covering indexes so per-period grouping runs off the index alone
+        "CREATE INDEX IF NOT EXISTS idx_tickets_hour_bucket ON tickets (hour_bucket, cook_pin, time_taken)",
+        "CREATE INDEX IF NOT EXISTS idx_tickets_day_bucket ON tickets (day_bucket, cook_pin, time_taken)",
+        "CREATE INDEX IF NOT EXISTS idx_tickets_week_bucket ON tickets (week_bucket, cook_pin, time_taken)",
+        "CREATE INDEX IF NOT EXISTS idx_tickets_month_bucket ON tickets (month_bucket, cook_pin, time_taken)",
+        rebuild_rollups_v6,  # Re-key the rollups from the new bucket columns
+    )),
+    (7, "keyset index for clock log paging", (
+        # ClockLogsScreen: ORDER BY clock_in_time DESC, id DESC with (clock_in_time, id) < (?, ?)
+        "CREATE INDEX IF NOT EXISTS idx_clock_logs_in_time ON clock_logs (clock_in_time, id)",
+    )),
+    (8, "open tickets on the kitchen board", (
+        # One row per running ticket, written through the ticket journal; the board
+        # is rebuilt from a rowid-ordered scan on cold start
+        '''
+        CREATE TABLE IF NOT EXISTS open_tickets (
+            ticket_id INTEGER PRIMARY KEY,
+            cook_pin INTEGER NOT NULL,  -- Current owner (changes on hand-off)
+            opened_at REAL NOT NULL,  -- UTC epoch seconds the timer started
+            handed_off_to TEXT  -- Cook name shown after a hand-off
+        )
+        ''',
+    )),
+    (9, "percentile sketches on the performance rollups", (
+        # Mergeable log-histogram per (granularity, period, cook), backfilled from the raw tickets
+        add_rollup_sketches,
+    )),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn=None):
+    """Return the schema version stored in PRAGMA user_version."""
+    conn = conn or get_connection()
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate():
+    """Apply every migration newer than the database's user_version, in order."""
+    current_version = get_schema_version()
+
+    for version, description, steps in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        # Each migration and its version bump commit (or roll back) together
+        with transaction(immediate=True) as conn:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+
+        print(f"Applied migration {version}: {description}")
+        current_version = version
+
+    return current_version
@@ -0,0 +1,59 @@
+from db.connection import get_connection
+
+_COLUMNS = "ticket_id, cook_pin, opened_at, handed_off_to"
+
+
+def _fold(ops):
+    """Collapse open/close/clear entries to (cleared, {ticket_id: last open entry or None})."""
+    cleared = False
+    latest = {}
+    for entry in ops:
+        if entry["op"] == "clear":
+            cleared = True
+            latest.clear()
+        elif entry["op"] == "open":
+            latest[entry["ticket_id"]] = entry
+        else:
+            latest[entry["ticket_id"]] = None
+    return cleared, latest
+
+
+def apply_board_ops(conn, ops):
+    """Write a batch of journal board entries to open_tickets; only each ticket's last op hits the table."""
+    cleared, latest = _fold(ops)
+    if cleared:
+        conn.execute("DELETE FROM open_tickets")
+
+    conn.executemany(
+        f"INSERT OR REPLACE INTO open_tickets ({_COLUMNS}) VALUES (?, ?, ?, ?)",
+        [(e["ticket_id"], e["cook_pin"], e["opened_at"], e["handed_off_to"]) for e in latest.values() if e is not None]
+    )
+    conn.executemany(
+        "DELETE FROM open_tickets WHERE ticket_id = ?",
+        [(ticket_id,) for ticket_id, e in latest.items() if e is None]
+    )
+
+
+def load_open_tickets(journal, conn=None):
+    """Return (ticket_id, cook_pin, opened_at, handed_off_to) for every open ticket, oldest first.
+
+    One rowid-ordered scan of open_tickets, with board changes still waiting in
+    the journal applied on top.
+    """
+    conn = conn or get_connection()
+    # Hold off the flusher so a batch can't move between the two reads
+    with journal.paused_flush():
+        rows = conn.execute(f"SELECT {_COLUMNS} FROM open_tickets ORDER BY ticket_id").fetchall()
+        ops = journal.pending_board_ops()
+
+    if not ops:
+        return rows
+
+    cleared, latest = _fold(ops)
+    board = {} if cleared else {row[0]: row for row in rows}
+    for ticket_id, entry in latest.items():
+        if entry is None:
+            board.pop(ticket_id, None)
+        else:
+            board[ticket_id] = (ticket_id, entry["cook_pin"], entry["opened_at"], entry["handed_off_to"])
+    return [board[ticket_id] for ticket_id in sorted(board)]
@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Small LRU of query results, invalidated by a data generation counter.
+
+    Every write that can change cached results (tickets landing in the rollups,
+    cook edits) calls bump(). Readers note the generation before they query
+    and put() the result with it, so a result computed while a write landed is
+    never cached. Safe to use from the DB worker and journal threads.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def bump(self):
+        """Invalidate everything cached so far."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, generation):
+        """Cache a value computed at `generation`; dropped if the data changed since."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# ✅ Shared cache for the performance views (and their exports)
+performance_cache = ResultCache()
@@ -0,0 +1,135 @@
+from db.time_buckets import GRANULARITIES, BUCKET_COLUMNS
+from db.sketches import LogHistogram
+
+# sketch_merge() is registered on every connection by db/connection.py
+UPSERT_ROLLUP_SQL = '''
+    INSERT INTO ticket_rollups
+        (granularity, bucket, cook_pin, ticket_count, total_time, min_time, max_time, sum_squares, sketch)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (granularity, bucket, cook_pin) DO UPDATE SET
+        ticket_count = ticket_count + excluded.ticket_count,
+        total_time = total_time + excluded.total_time,
+        min_time = MIN(min_time, excluded.min_time),
+        max_time = MAX(max_time, excluded.max_time),
+        sum_squares = sum_squares + excluded.sum_squares,
+        sketch = sketch_merge(sketch, excluded.sketch)
+'''
+
+
+def create_rollup_table(conn):
+    """Create the (granularity, period bucket, cook) aggregate table."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS ticket_rollups (
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            cook_pin INTEGER NOT NULL,
+            ticket_count INTEGER NOT NULL,
+            total_time INTEGER NOT NULL,
+            min_time INTEGER NOT NULL,
+            max_time INTEGER NOT NULL,
+            sum_squares INTEGER NOT NULL,
+            PRIMARY KEY (granularity, bucket, cook_pin)
+        ) WITHOUT ROWID
+    ''')
+
+
+def apply_to_rollups(conn, tickets):
+    """Fold (cook_pin, time_taken, bucket_keys) tickets into every granularity's rollups.
+
+    The batch is pre-aggregated in memory so each touched row is upserted once,
+    its percentile sketch included. Must run inside the same transaction that
+    inserts the tickets.
+    """
+    groups = {}
+    for cook_pin, time_taken, buckets in tickets:
+        for granularity, bucket in zip(GRANULARITIES, buckets):
+            key = (granularity, bucket, cook_pin)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [1, time_taken, time_taken, time_taken, time_taken * time_taken,
+                               LogHistogram().add(time_taken)]
+            else:
+                group[0] += 1
+                group[1] += time_taken
+                group[2] = min(group[2], time_taken)
+                group[3] = max(group[3], time_taken)
+                group[4] += time_taken * time_taken
+                group[5].add(time_taken)
+
+    conn.executemany(UPSERT_ROLLUP_SQL, [key + tuple(values[:5]) + (values[5].to_bytes(),)
+                                         for key, values in groups.items()])
+
+
+def rebuild_rollups(conn):
+    """Recompute every rollup from the raw tickets table, grouped in SQL."""
+    conn.execute("DELETE FROM ticket_rollups")
+    for granularity in GRANULARITIES:
+        column = BUCKET_COLUMNS[granularity]
+        conn.execute(f'''
+            INSERT INTO ticket_rollups
+                (granularity, bucket, cook_pin, ticket_count, total_time, min_time, max_time, sum_squares)
+            SELECT ?, {column}, cook_pin, COUNT(*), SUM(time_taken), MIN(time_taken), MAX(time_taken),
+                   SUM(time_taken * time_taken)
+            FROM tickets
+            GROUP BY {column}, cook_pin
+        ''', (granularity,))
+    rebuild_sketches(conn)
+
+
+def add_rollup_sketches(conn):
+    """Add the percentile sketch column to ticket_rollups and fill it from the raw tickets."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(ticket_rollups)")]
+    if "sketch" not in columns:
+        conn.execute("ALTER TABLE ticket_rollups ADD COLUMN sketch BLOB")
+    rebuild_sketches(conn)
+
+
+def rebuild_sketches(conn):
+    """Recompute every rollup's sketch, one (period, cook) group at a time off the covering indexes."""
+    for granularity in GRANULARITIES:
+        column = BUCKET_COLUMNS[granularity]
+        rows = conn.execute(f"SELECT {column}, cook_pin, time_taken FROM tickets ORDER BY {column}, cook_pin")
+        updates, key, sketch = [], None, None
+        for bucket, cook_pin, time_taken in rows:
+            if (bucket, cook_pin) != key:
+                if key is not None:
+                    updates.append((sketch.to_bytes(), granularity) + key)
+                key, sketch = (bucket, cook_pin), LogHistogram()
+            sketch.add(time_taken)
+        if key is not None:
+            updates.append((sketch.to_bytes(), granularity) + key)
+        conn.executemany(
+            "UPDATE ticket_rollups SET sketch = ? WHERE granularity = ? AND bucket = ? AND cook_pin = ?", updates)
+
+
+def rollups_query(granularity, start_bucket, end_bucket=None, cook_pin=None):
+    """(sql, params) behind load_rollups."""
+    if granularity not in BUCKET_COLUMNS:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    query = '''
+        SELECT r.bucket, r.cook_pin, cooks.name, r.min_time, r.max_time, r.total_time, r.ticket_count,
+               r.total_time / r.ticket_count AS average, r.sketch
+        FROM ticket_rollups AS r
+        INNER JOIN cooks ON cooks.pin = r.cook_pin
+        WHERE r.granularity = ? AND r.bucket >= ?
+    '''
+    params = [granularity, start_bucket]
+    if end_bucket is not None:
+        query += " AND r.bucket <= ?"
+        params.append(end_bucket)
+    if cook_pin is not None:
+        query += " AND r.cook_pin = ?"
+        params.append(cook_pin)
+    query += " ORDER BY r.bucket ASC, average ASC, cooks.name ASC"
+    return query, params
+
+
+def load_rollups(conn, granularity, start_bucket, end_bucket=None, cook_pin=None):
+    """Return (bucket, cook_pin, cook_name, fastest, slowest, total, count, average, sketch) rows for a bucket range.
+
+    Both ends are inclusive period keys (end_bucket=None means open-ended). The
+    range is a primary-key scan of ticket_rollups; each period's cooks come back
+    fastest average first.
+    """
+    return conn.execute(*rollups_query(granularity, start_bucket, end_bucket, cook_pin)).fetchall()
@@ -0,0 +1,85 @@
+import math, struct
+
+# Log-spaced bins: bin i >= 1 holds times in [GAMMA^(i-1), GAMMA^i) seconds, bin 0 holds
+# sub-second times. Any quantile read back is within ~2.4% ((GAMMA-1)/(GAMMA+1)) of a real
+# ticket time, whatever the spread; the top bin also takes anything past ~67 hours.
+SKETCH_GAMMA = 1.05
+SKETCH_BINS = 256
+SKETCH_VERSION = 1
+_LOG_GAMMA = math.log(SKETCH_GAMMA)
+_BIN = struct.Struct("<BI")  # Stored sparse: (bin, count) pairs after a version byte
+
+
+class LogHistogram:
+    """Mergeable fixed-bin log histogram of ticket times (seconds).
+
+    Two histograms merge by adding their bin counts, so per-period sketches can
+    be combined into any range without going back to the raw tickets.
+    """
+    __slots__ = ("counts",)
+
+    def __init__(self, counts=None):
+        self.counts = dict(counts or {})  # bin -> ticket count
+
+    @staticmethod
+    def bin_of(seconds):
+        if seconds < 1:
+            return 0
+        return min(1 + int(math.log(seconds) / _LOG_GAMMA), SKETCH_BINS - 1)
+
+    @staticmethod
+    def bin_value(index):
+        """Representative time of a bin (its harmonic midpoint, which bounds the relative error)."""
+        if index == 0:
+            return 0.0
+        lower, upper = SKETCH_GAMMA ** (index - 1), SKETCH_GAMMA ** index
+        return 2 * lower * upper / (lower + upper)
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    def add(self, seconds, count=1):
+        index = self.bin_of(seconds)
+        self.counts[index] = self.counts.get(index, 0) + count
+        return self
+
+    def merge(self, other):
+        """Add another histogram's counts into this one (in place)."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile (0..1) in seconds, or None when empty."""
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen > rank:
+                return self.bin_value(index)
+        return self.bin_value(max(self.counts))
+
+    def to_bytes(self):
+        return bytes([SKETCH_VERSION]) + b"".join(_BIN.pack(index, self.counts[index]) for index in sorted(self.counts))
+
+    @classmethod
+    def from_bytes(cls, blob):
+        """Decode a stored sketch; None (a row without one yet) gives an empty histogram."""
+        if not blob:
+            return cls()
+        if blob[0] != SKETCH_VERSION:
+            raise ValueError(f"Unsupported sketch version: {blob[0]}")
+        return cls(_BIN.iter_unpack(blob[1:]))
+
+
+def merge_sketch_blobs(first, second):
+    """SQLite sketch_merge(a, b): merge two stored sketches (used by the rollup upsert)."""
+    if not first:
+        return second
+    if not second:
+        return first
+    return LogHistogram.from_bytes(first).merge(LogHistogram.from_bytes(second)).to_bytes()
@@ -0,0 +1,138 @@
+import threading, pytz
+from datetime import datetime, timedelta
+from db.connection import transaction
+from db.ticket_journal import ticket_journal
+from db.time_buckets import LOCAL_TIMEZONE
+
+# One cook's tickets in one business-day range, off idx_tickets_cook_logged_at
+COOK_DAY_STATS_SQL = """
+    SELECT MIN(time_taken), MAX(time_taken), SUM(time_taken), COUNT(*)
+    FROM tickets
+    WHERE cook_pin = ? AND logged_at >= ? AND logged_at < ?
+"""
+
+# Local hour at which a new business day starts. 0 = midnight; a late-night
+# kitchen can set e.g. 4 so tickets closed at 1 AM still count for the shift.
+BUSINESS_DAY_CUTOFF_HOUR = 0
+
+
+def normalize_pin(cook_pin):
+    """Return a cook PIN as an int (restored sessions store it as a 1-tuple)."""
+    if isinstance(cook_pin, (tuple, list)):
+        cook_pin = cook_pin[0]
+    return int(cook_pin)
+
+
+class CookDayStats:
+    """Running min/max/sum/count for one cook on one business day."""
+    __slots__ = ("count", "total", "fastest", "slowest")
+
+    def __init__(self, count=0, total=0, fastest=None, slowest=None):
+        self.count = count
+        self.total = total
+        self.fastest = fastest
+        self.slowest = slowest
+
+    def add(self, time_taken):
+        self.count += 1
+        self.total += time_taken
+        self.fastest = time_taken if self.fastest is None else min(self.fastest, time_taken)
+        self.slowest = time_taken if self.slowest is None else max(self.slowest, time_taken)
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+
+class DailyStatsCache:
+    """In-memory per-(cook, business day) ticket stats for the KitchenPanel header.
+
+    The first lookup for a cook on a given day seeds the entry with one indexed
+    query (plus anything still in the write-behind journal); every ticket after
+    that is folded in with record() in O(1). Entries from earlier business days
+    are dropped as soon as the day rolls over.
+    """
+
+    def __init__(self, timezone=LOCAL_TIMEZONE, cutoff_hour=BUSINESS_DAY_CUTOFF_HOUR):
+        self.timezone = timezone
+        self.cutoff_hour = cutoff_hour
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def business_day(self, when=None):
+        """Return the business day (a date) that a UTC/aware datetime belongs to."""
+        local_dt = (when or datetime.now(pytz.utc)).astimezone(self.timezone)
+        return (local_dt - timedelta(hours=self.cutoff_hour)).date()
+
+    def day_bounds(self, day):
+        """Return the [start, end) epoch seconds of a business day."""
+        start = self.timezone.localize(datetime(day.year, day.month, day.day, self.cutoff_hour))
+        end = self.timezone.localize(datetime(day.year, day.month, day.day, self.cutoff_hour) + timedelta(days=1))
+        return int(start.timestamp()), int(end.timestamp())
+
+    def seconds_until_rollover(self, now=None):
+        """Seconds until the next business day starts."""
+        now = now or datetime.now(pytz.utc)
+        next_day = self.business_day(now) + timedelta(days=1)
+        next_start = self.timezone.localize(datetime(next_day.year, next_day.month, next_day.day, self.cutoff_hour))
+        return max((next_start - now).total_seconds(), 0)
+
+    def get(self, cook_pin):
+        """Return today's stats for a cook, seeding from the database on first use."""
+        cook_pin = normalize_pin(cook_pin)
+        day = self.business_day()
+        with self._lock:
+            stats = self._stats.get((cook_pin, day))
+        return stats if stats is not None else self.seed(cook_pin, day)
+
+    def record(self, cook_pin, time_taken, when=None):
+        """Fold one completed ticket into the cache.
+
+        Call this before handing the ticket to the journal so a first-time seed
+        doesn't count it twice.
+        """
+        cook_pin = normalize_pin(cook_pin)
+        day = self.business_day(when)
+        with self._lock:
+            stats = self._stats.get((cook_pin, day))
+        if stats is None:
+            stats = self.seed(cook_pin, day)
+        with self._lock:
+            stats.add(int(time_taken))
+
+    def seed(self, cook_pin, day=None):
+        """Load one cook's stats for a business day with a single query."""
+        cook_pin = normalize_pin(cook_pin)
+        day = day or self.business_day()
+        day_start, day_end = self.day_bounds(day)
+
+        # Never waits on the journal flusher: take the waiting tickets first, then read the
+        # table and the journal's seq watermark from one snapshot. Every pending entry
+        # is then either at or below the watermark (already counted by the query) or
+        # above it (still only in memory), whenever a flush lands in between.
+        pending = ticket_journal.pending(cook_pin, day_start, day_end)
+        with transaction() as conn:
+            fastest, slowest, total, count = conn.execute(
+                COOK_DAY_STATS_SQL, (cook_pin, day_start, day_end)).fetchone()
+            flushed_seq = ticket_journal.flushed_seq(conn)
+
+        stats = CookDayStats(count, total or 0, fastest, slowest)
+        for entry in pending:
+            if entry["seq"] > flushed_seq:
+                stats.add(entry["time_taken"])
+
+        with self._lock:
+            # Drop entries left over from previous business days
+            current_day = self.business_day()
+            for key in [key for key in self._stats if key[1] < current_day]:
+                del self._stats[key]
+            self._stats[(cook_pin, day)] = stats
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# ✅ Shared cache used by the kitchen panel header
+daily_stats = DailyStatsCache()
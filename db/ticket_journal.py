@@ -0,0 +1,235 @@
+import os, json, threading, sqlite3, traceback
+from contextlib import contextmanager
+from db.connection import transaction, get_connection, close_connection
+from db.rollups import apply_to_rollups
+from db.time_buckets import bucket_keys, legacy_date_to_epoch
+from db.open_tickets import apply_board_ops
+from db.result_cache import performance_cache
+
+# Flush once this many tickets are waiting...
+FLUSH_BATCH_SIZE = 8
+# ...or once the oldest waiting ticket is this old
+FLUSH_INTERVAL_MS = 1500
+
+JOURNAL_NAME = "tickets"
+
+
+def _default_spill_path():
+    from db.db_initialization import db_folder
+    return os.path.join(db_folder, "ticket_spill.jsonl")
+
+
+class TicketJournal:
+    """Write-behind queue for completed tickets and the open-ticket board.
+
+    append() makes a ticket durable by writing one fsync'd line to an
+    append-only spill file and returns immediately. A background thread then
+    inserts waiting tickets in a single executemany transaction, either every
+    FLUSH_BATCH_SIZE tickets or every FLUSH_INTERVAL_MS. Each entry carries a
+    sequence number and the highest flushed number is committed together with
+    the rows, so replaying the spill file after a crash never double-inserts.
+
+    open_ticket() / close_ticket() / clear_open_tickets() go through the same
+    file and batches ("op" entries) to keep the open_tickets table in step
+    with the board.
+    """
+
+    def __init__(self, spill_path=None, batch_size=FLUSH_BATCH_SIZE, flush_interval_ms=FLUSH_INTERVAL_MS):
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._pending = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Serializes flushes from the thread and flush_now()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._spill_file = None
+        self._thread = None
+
+    def start(self):
+        """Replay anything left in the spill file, then start the flusher thread."""
+        if self._thread is not None:
+            return
+        if self.spill_path is None:
+            self.spill_path = _default_spill_path()
+
+        self._recover()
+        self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        if self._pending:
+            self.flush_now()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ticket-journal", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Flush everything that's waiting and stop the flusher thread."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.flush_now()
+        if self._spill_file:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def append(self, cook_pin, logged_at, time_taken):
+        """Durably queue one completed ticket (logged_at in UTC epoch seconds); the DB insert happens later."""
+        return self._append({"cook_pin": int(cook_pin), "logged_at": int(logged_at), "time_taken": int(time_taken)})
+
+    def open_ticket(self, ticket_id, cook_pin, opened_at, handed_off_to=None):
+        """Durably record a running ticket on the board (replaces its row, e.g. after a hand-off)."""
+        return self._append({"op": "open", "ticket_id": int(ticket_id), "cook_pin": int(cook_pin),
+                             "opened_at": float(opened_at), "handed_off_to": handed_off_to})
+
+    def close_ticket(self, ticket_id):
+        """Durably drop a ticket from the board (Order Out or cancel)."""
+        return self._append({"op": "close", "ticket_id": int(ticket_id)})
+
+    def clear_open_tickets(self):
+        """Durably drop every ticket from the board."""
+        return self._append({"op": "clear"})
+
+    def _append(self, entry):
+        with self._lock:
+            self._seq += 1
+            entry["seq"] = self._seq
+            if self._spill_file is not None:
+                self._spill_file.write(json.dumps(entry) + "\n")
+                self._spill_file.flush()
+                os.fsync(self._spill_file.fileno())
+            self._pending.append(entry)
+            batch_full = len(self._pending) >= self.batch_size
+
+        if batch_full or self._thread is None:
+            self._wake.set()
+            if self._thread is None:
+                self.flush_now()  # Not started (e.g. during tests/tools): write through
+        return entry
+
+    def pending(self, cook_pin=None, since=None, until=None):
+        """Return unflushed tickets, optionally filtered by cook and [since, until) epoch range."""
+        with self._lock:
+            entries = list(self._pending)
+        return [
+            entry for entry in entries
+            if "op" not in entry
+            and (cook_pin is None or entry["cook_pin"] == int(cook_pin))
+            and (since is None or entry["logged_at"] >= since)
+            and (until is None or entry["logged_at"] < until)
+        ]
+
+    def flushed_seq(self, conn):
+        """Highest seq already in SQLite, as seen by conn's current transaction (0 if none yet)."""
+        row = conn.execute("SELECT last_seq FROM journal_state WHERE name = ?", (JOURNAL_NAME,)).fetchone()
+        return row[0] if row else 0
+
+    def pending_board_ops(self):
+        """Return unflushed open/close/clear entries, oldest first."""
+        with self._lock:
+            return [entry for entry in self._pending if "op" in entry]
+
+    @contextmanager
+    def paused_flush(self):
+        """Block flushes for the duration of a block (for consistent DB + pending reads)."""
+        with self._flush_lock:
+            yield
+
+    def flush_now(self):
+        """Insert every waiting ticket in one transaction. Returns the number written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            if not batch:
+                return 0
+
+            try:
+                with transaction(immediate=True) as conn:
+                    self._write_batch(conn, batch)
+            except sqlite3.Error as e:
+                print(f"Ticket journal flush failed, will retry: {e}")
+                return 0
+            if any("op" not in entry for entry in batch):
+                performance_cache.bump()  # New tickets are in the rollups now; cached views are stale
+
+            flushed_seq = batch[-1]["seq"]
+            with self._lock:
+                self._pending = [entry for entry in self._pending if entry["seq"] > flushed_seq]
+                if not self._pending and self._spill_file is not None:
+                    # Everything in the file is now in SQLite; start it over
+                    self._spill_file.seek(0)
+                    self._spill_file.truncate()
+                    self._spill_file.flush()
+                    os.fsync(self._spill_file.fileno())
+            return len(batch)
+
+    def _write_batch(self, conn, batch):
+        rows = []
+        rollup_rows = []
+        board_ops = []
+        for entry in batch:
+            if "op" in entry:
+                board_ops.append(entry)
+                continue
+            buckets = bucket_keys(entry["logged_at"])  # Local period keys, computed once per ticket
+            rows.append((entry["cook_pin"], entry["logged_at"], entry["time_taken"]) + buckets)
+            rollup_rows.append((entry["cook_pin"], entry["time_taken"], buckets))
+
+        if rows:
+            conn.executemany('''
+                INSERT INTO tickets
+                    (cook_pin, logged_at, time_taken, hour_bucket, day_bucket, week_bucket, month_bucket)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            apply_to_rollups(conn, rollup_rows)  # Keep the performance rollups in step with the raw rows
+        if board_ops:
+            apply_board_ops(conn, board_ops)
+        conn.execute(
+            "INSERT OR REPLACE INTO journal_state (name, last_seq) VALUES (?, ?)",
+            (JOURNAL_NAME, batch[-1]["seq"])
+        )
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush_now()
+            except Exception as e:
+                # Anything besides a SQLite error: log it and keep the thread alive, the batch
+                # stays queued (and in the spill file) for the next attempt
+                print(f"Ticket journal flusher error, will retry: {e!r}")
+                traceback.print_exc()
+        close_connection()
+
+    def _recover(self):
+        """Load spilled entries that never reached SQLite back into the queue."""
+        last_flushed = self.flushed_seq(get_connection())
+        self._seq = last_flushed
+
+        if not os.path.exists(self.spill_path):
+            return
+
+        recovered = []
+        with open(self.spill_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line from a crash mid-write
+                if "date" in entry:  # Spilled by a build that stored text dates
+                    entry["logged_at"] = legacy_date_to_epoch(entry.pop("date"))
+                self._seq = max(self._seq, entry["seq"])
+                if entry["seq"] > last_flushed:
+                    recovered.append(entry)
+
+        if recovered:
+            print(f"Recovered {len(recovered)} unflushed ticket(s) from the spill file.")
+        self._pending = recovered
+
+
+# ✅ Shared journal used by the kitchen panel
+ticket_journal = TicketJournal()
@@ -0,0 +1,70 @@
+import pytz
+from datetime import datetime, timedelta
+
+LOCAL_TIMEZONE = pytz.timezone("America/New_York")  # Change to your actual timezone
+
+# Period key formats for each performance view (lexically sortable). The order
+# matches the tickets.*_bucket columns and the tuple returned by bucket_keys().
+GRANULARITY_FORMATS = {
+    "hour": "%Y-%m-%d %H:00",
+    "day": "%Y-%m-%d",
+    "week": "%Y-%W",
+    "month": "%Y-%m",
+}
+GRANULARITIES = tuple(GRANULARITY_FORMATS)
+
+# tickets column holding the precomputed key for each granularity
+BUCKET_COLUMNS = {granularity: f"{granularity}_bucket" for granularity in GRANULARITIES}
+
+LEGACY_TICKET_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # UTC text stored in tickets.date before schema v6
+
+
+def bucket_keys(epoch_seconds):
+    """Return the (hour, day, week, month) local period keys for a UTC epoch timestamp."""
+    local_dt = datetime.fromtimestamp(epoch_seconds, LOCAL_TIMEZONE)
+    return tuple(local_dt.strftime(fmt) for fmt in GRANULARITY_FORMATS.values())
+
+
+def bucket_key(local_dt, granularity):
+    """Return the period key of an aware local datetime for one granularity."""
+    return local_dt.strftime(GRANULARITY_FORMATS[granularity])
+
+
+def legacy_date_to_epoch(utc_date):
+    """Convert a pre-v6 tickets.date string ('YYYY-MM-DD HH:MM:SS', UTC) to epoch seconds."""
+    return int(datetime.strptime(utc_date, LEGACY_TICKET_DATE_FORMAT).replace(tzinfo=pytz.utc).timestamp())
+
+
+def period_bounds(local_dt, granularity):
+    """Return the (start, end) aware local datetimes of the period containing local_dt (end exclusive).
+
+    Weeks follow %W (Monday first) but never cross a year boundary, matching
+    bucket_key: the days before a year's first Monday are its week 00.
+    """
+    naive = local_dt.replace(tzinfo=None)
+    if granularity == "hour":
+        start = naive.replace(minute=0, second=0, microsecond=0)
+        end = start + timedelta(hours=1)
+    elif granularity == "day":
+        start = naive.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=1)
+    elif granularity == "week":
+        day = naive.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = max(day - timedelta(days=day.weekday()), day.replace(month=1, day=1))
+        end = min(day + timedelta(days=7 - day.weekday()), day.replace(year=day.year + 1, month=1, day=1))
+    elif granularity == "month":
+        start = naive.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        end = start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+    else:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    return _localize_boundary(start), _localize_boundary(end)
+
+
+def _localize_boundary(naive):
+    """First instant a local wall time occurs (after the gap if DST skipped it)."""
+    try:
+        return LOCAL_TIMEZONE.localize(naive, is_dst=None)
+    except pytz.AmbiguousTimeError:
+        return LOCAL_TIMEZONE.localize(naive, is_dst=True)
+    except pytz.NonExistentTimeError:
+        return LOCAL_TIMEZONE.localize(naive, is_dst=False)
@@ -1,4 +1,4 @@
-import sqlite3, os, pytz
+import os, pytz
 from kivy.app import App
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
@@ -12,6 +12,12 @@ from screens.manager_screen import ManagerScreen
 from screens.clock_logs_screen import ClockLogsScreen
 from utils.global_context import GlobalContext
 from db.db_initialization import init_database
+from db.connection import get_connection, transaction, close_all
+from db.clock_logs import LATEST_OPEN_SHIFT_SQL
+from db.checkpoint import CheckpointScheduler
+from db.ticket_journal import ticket_journal
+from db.executor import db_executor
+from utils.idle_governor import idle_governor
 from kivy.utils import platform
 
 if platform == "android":
@@ -58,8 +64,11 @@ class SplashScreen(Screen):
 class TicketApp(App):
     def build(self):
         init_database()
+        ticket_journal.start()  # ✅ Replays tickets left in the spill file by a killed session
+        self.checkpoint_scheduler = CheckpointScheduler()
 
         self.screen_manager = ScreenManager()
+        self.screen_manager.bind(current=lambda *args: idle_governor.wake())  # Run transitions at full frame rate
 
         # Add Splash Screen first
         self.screen_manager.add_widget(SplashScreen(name="splash_screen"))
@@ -75,6 +84,28 @@ class TicketApp(App):
         Clock.schedule_once(lambda dt: setattr(self.screen_manager, "current", "splash_screen"), 0.1)
         Clock.schedule_once(lambda dt: self.restore_logged_in_user(),3.0)  # ✅ Run AFTER splash transition (adjust time)
         self.schedule_auto_clock_out()
+        self.checkpoint_scheduler.start()  # ✅ Fold the WAL back into the database while idle
+        idle_governor.start()  # ✅ Drop the frame rate when no tickets are running and nobody is touching the screen
+
+    def on_pause(self):
+        """Push queued tickets into SQLite before Android may suspend or kill the app."""
+        ticket_journal.flush_now()
+        return True
+
+    def on_resume(self):
+        """Re-sync the open-ticket board after Android resumes the app."""
+        idle_governor.wake()
+        if self.screen_manager.has_screen("kitchen_panel"):
+            self.screen_manager.get_screen("kitchen_panel").on_resume()
+
+    def on_stop(self):
+        """Flush queued tickets and close the shared database connections when the app exits."""
+        ticket_journal.stop()
+        self.checkpoint_scheduler.stop()
+        idle_governor.stop()
+        print(f"Frame rate governor: {idle_governor.summary()}")
+        db_executor.shutdown()
+        close_all()
 
     def restore_logged_in_user(self):
         """Restore the last logged-in user from file storage or database."""
@@ -95,15 +126,11 @@ class TicketApp(App):
             print("Database not found, requiring new login.")
             return
 
-        conn = sqlite3.connect(db_path)
+        conn = get_connection()
         cursor = conn.cursor()
 
         # ✅ Step 2A: Get the most recent logged-in employee (if no manager is set)
-        cursor.execute('''
-            SELECT employee_name FROM clock_logs
-            WHERE clock_out_time IS NULL
-            ORDER BY clock_in_time DESC LIMIT 1
-        ''')
+        cursor.execute(LATEST_OPEN_SHIFT_SQL)
         result = cursor.fetchone()
 
         if result:
@@ -135,8 +162,6 @@ class TicketApp(App):
         else:
             print("No active user found, requiring new login.")
 
-        conn.close()
-
     def update_cook_label(self, cook_name, pin):
         """Updates the cook label in the Kitchen Panel Screen and sets PIN when applicable."""
         try:
@@ -153,6 +178,7 @@ class TicketApp(App):
                     print(f"No PIN needed for {cook_name} (likely a Manager).")
 
             kitchen_panel.entered_pin = pin if pin else ""  # ✅ Avoids errors when PIN is missing
+            kitchen_panel.update_stats()  # ✅ Seeds today's stats cache for the restored cook
 
         except Exception as e:
             print(f"Error updating cook label or PIN: {e}")
@@ -184,37 +210,30 @@ class TicketApp(App):
             print("Database not found, cannot process auto clock-out.")
             return
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # ✅ Find all cooks still clocked in (clock_out_time IS NULL)
-        cursor.execute('''
-            SELECT id, employee_name FROM clock_logs
-            WHERE clock_out_time IS NULL
-        ''')
-        active_users = cursor.fetchall()
+        with transaction() as conn:
+            # ✅ Find all cooks still clocked in (clock_out_time IS NULL)
+            active_users = conn.execute('''
+                SELECT id, employee_name FROM clock_logs
+                WHERE clock_out_time IS NULL
+            ''').fetchall()
 
-        if not active_users:
-            print("No active cooks to clock out.")
-        else:
-            # ✅ Set local time to 11:00 PM
-            local_tz = pytz.timezone("America/New_York")  # Change this to your timezone!
-            local_time = datetime.now(local_tz).replace(hour=23, minute=0, second=0, microsecond=0)
+            if not active_users:
+                print("No active cooks to clock out.")
+            else:
+                # ✅ Set local time to 11:00 PM
+                local_tz = pytz.timezone("America/New_York")  # Change this to your timezone!
+                local_time = datetime.now(local_tz).replace(hour=23, minute=0, second=0, microsecond=0)
 
-            # ✅ Convert to UTC
-            clock_out_time_utc = local_time.astimezone(pytz.utc).isoformat()
+                # ✅ Convert to UTC
+                clock_out_time_utc = local_time.astimezone(pytz.utc).isoformat()
 
-            for user_id, employee_name in active_users:
-                cursor.execute('''
+                conn.executemany('''
                     UPDATE clock_logs
                     SET clock_out_time = ?, status = 'Clocked Out'
                     WHERE id = ?
-                ''', (clock_out_time_utc, user_id))
-                print(f"Clocked out {employee_name} at {clock_out_time_utc} UTC.")
-
-            conn.commit()
-
-        conn.close()
+                ''', [(clock_out_time_utc, user_id) for user_id, _ in active_users])
+                for _, employee_name in active_users:
+                    print(f"Clocked out {employee_name} at {clock_out_time_utc} UTC.")
 
         # ✅ Reschedule for the next day
         self.schedule_auto_clock_out()
@@ -7,7 +7,8 @@ from kivy.graphics import Color, Rectangle
 from kivy.uix.anchorlayout import AnchorLayout
 from utils.customboxlayouts import RoundedButton
 import sqlite3
-from db.db_initialization import db_path  # ✅ Import the correct path
+from db.connection import transaction
+from db.result_cache import performance_cache
 
 
 class AddCookScreen(Screen):
@@ -143,13 +144,10 @@ class AddCookScreen(Screen):
             return
 
         try:
-            from db.db_initialization import db_path  # ✅ Use the correct database path
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Insert the new cook into the cooks table
-            cursor.execute("INSERT INTO cooks (pin, name) VALUES (?, ?)", (int(pin), name))
-            conn.commit()
+            # Insert the new cook into the cooks table (rolled back automatically on error)
+            with transaction() as conn:
+                conn.execute("INSERT INTO cooks (pin, name) VALUES (?, ?)", (int(pin), name))
+            performance_cache.bump()  # Cook names are joined into the cached performance views
             self.show_message(f"Cook {name} added successfully!", error=False)
 
             # Clear inputs and return to the previous screen
@@ -157,10 +155,7 @@ class AddCookScreen(Screen):
             self.pin_input.text = ""
             self.manager.current = "kitchen_login"
         except sqlite3.IntegrityError:
-            conn.rollback()  # ✅ Rollback transaction to prevent lock issues
             self.show_message(f"Error: A cook with PIN {pin} already exists.", error=True)
-        finally:
-            conn.close()  # ✅ Always close the database connection
 
     def cancel_action(self, instance):
         """Return to the appropriate login panel based on the side."""
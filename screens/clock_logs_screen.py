@@ -1,12 +1,15 @@
 from kivy.uix.screenmanager import Screen
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from datetime import datetime
-from utils.customboxlayouts import RoundedBoxLayout, RoundedButton, ColoredBoxLayout
-import sqlite3, pytz
-from db.db_initialization import db_path
+from utils.customboxlayouts import RoundedButton, ColoredBoxLayout
+from utils.widgets import StickyHeaderList, section_row, grid_row, message_row
+import pytz
+from db.executor import db_executor
+from db.clock_logs import fetch_first_page, fetch_page_before, page_cursor, PAGE_SIZE
+
+LOG_COLUMNS = ("Name", "Clock-In", "Clock-Out", "Status")
+MUTED_TEXT_COLOR = (0.506, 0.522, 0.565, 1)
 
 
 class ClockLogsScreen(Screen):
@@ -23,13 +26,11 @@ class ClockLogsScreen(Screen):
         header.add_widget(self.title_label)
         main_layout.add_widget(header)
 
-        # Scrollable Middle Content
+        # Scrollable Middle Content (virtualized: only on-screen rows are built)
         scrollable_container = BoxLayout(orientation="vertical", size_hint=(1, 1), padding=10)
-        scroll_view = ScrollView(size_hint=(1, 1), do_scroll_x=False, do_scroll_y=True)
-        self.data_container = BoxLayout(orientation="vertical", spacing=10, size_hint_y=None)
-        self.data_container.bind(minimum_height=self.data_container.setter("height"))
-        scroll_view.add_widget(self.data_container)
-        scrollable_container.add_widget(scroll_view)
+        self.log_list = StickyHeaderList(spacing=2, size_hint=(1, 1))
+        self.log_list.recycle_view.bind(scroll_y=self.on_scroll)  # Load older pages near the bottom
+        scrollable_container.add_widget(self.log_list)
         main_layout.add_widget(scrollable_container)
 
         # Footer (Buttons)
@@ -55,122 +56,95 @@ class ClockLogsScreen(Screen):
         self.populate_logs()
 
     def populate_logs(self):
-        """Fetch and display clock-in logs from the database."""
-        self.data_container.clear_widgets()
-
+        """Fetch the most recent clock-in logs in the background; older pages load on scroll."""
+        db_executor.cancel_all(self)  # A refresh supersedes anything still loading
+        self.page_cursor = None
+        self.has_more_pages = False
+        self.loading_page = False
+        self.last_log_date = None  # Day of the bottom-most rendered row
+
+        self.log_list.set_data([message_row("Loading clock-in logs...", color=MUTED_TEXT_COLOR)])
+        db_executor.submit(fetch_first_page, on_result=self.show_first_page, on_error=self.show_load_error, owner=self)
+
+    def show_first_page(self, rows):
+        if not rows:
+            self.log_list.set_data([message_row("No clock-in logs found!")])
+            return
+
+        self.log_list.set_data([])
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            # Query clock logs
-            cursor.execute('''
-                SELECT employee_name, clock_in_time, clock_out_time, status
-                FROM clock_logs
-                ORDER BY clock_in_time DESC
-            ''')
-            results = cursor.fetchall()
-            conn.close()
-
-            if not results:
-                self.data_container.add_widget(Label(text="No clock-in logs found!", font_size=18))
-                return
-
-            # Define timezone adjustment and formats
-            date_format = "%a %b %d"  # Format for the day header
-            time_format = "%I:%M%p"  # Format for clock-in and clock-out times
-
-            # Group logs by day
-            logs_by_date = {}
-            for employee_name, clock_in, clock_out, status in results:
-                # Parse and adjust clock-in time
-                clock_in_dt = self.parse_iso_datetime(clock_in)
-                formatted_clock_in = clock_in_dt.strftime(time_format)  # Now shows correct local time
-                clock_in_date = clock_in_dt.strftime(date_format)  # Group by this date
-
-                # Parse and adjust clock-out time if available
-                if clock_out:
-                    clock_out_dt = self.parse_iso_datetime(clock_out)
-                    formatted_clock_out = clock_out_dt.strftime(time_format)
-                else:
-                    formatted_clock_out = "N/A"
-
-                # Group logs by date
-                logs_by_date.setdefault(clock_in_date, []).append(
-                    (employee_name, formatted_clock_in, formatted_clock_out, status))
-
-            # Display logs grouped by date
-            for log_date, logs in logs_by_date.items():
-                # Create a grid for logs within a ScrollView
-                grid = GridLayout(cols=4, spacing=10, size_hint_y=None, padding=[20, 10, 20, 10])
-                grid.bind(minimum_height=grid.setter("height"))
-
-                # Add headers
-                headers = ["Name", "Clock-In", "Clock-Out", "Status"]
-                for header in headers:
-                    grid.add_widget(Label(text=header, bold=True, size_hint_y=None, height=40, underline=True))
-
-                # Add log entries
-                for employee_name, clock_in, clock_out, status in logs:
-                    grid.add_widget(Label(text=employee_name, size_hint_y=None, height=40))
-                    grid.add_widget(Label(text=clock_in, size_hint_y=None, height=40))
-                    grid.add_widget(Label(text=clock_out, size_hint_y=None, height=40))
-                    grid.add_widget(Label(text=status, size_hint_y=None, height=40))
-
-                # Wrap the grid in a ScrollView for individual day scrolling
-                day_scroll_view = ScrollView(size_hint=(1, None), height=300)  # Adjust height as needed
-                day_scroll_view.add_widget(grid)
-
-                # Create a container for the rounded box
-                container = BoxLayout(orientation="vertical", size_hint=(0.95, None))
-
-                # Add a properly sized date label inside the rounded box
-                date_label = Label(
-                    text=f"[b]{log_date}[/b]",
-                    size_hint_y=None,
-                    height=50,
-                    markup=True,
-                    bold=True,
-                    color=(0.714, 0.569, 0.129, 1),
-                    underline=True
-                )
-
-                # Wrap the ScrollView and date label in a rounded box
-                rounded_box = RoundedBoxLayout(
-                    orientation="vertical",
-                    size_hint=(0.95, None),
-                    padding=30,
-                    spacing=10,
-                    color=(0.204, 0.408, 0.373, 1),  # Green background
-                    valign="left",
-                )
-                rounded_box.add_widget(date_label)
-                rounded_box.add_widget(day_scroll_view)  # Add the ScrollView here
-
-                # Outer container for visual distinction
-                rounded_box_outter = RoundedBoxLayout(
-                    orientation="vertical",
-                    size_hint=(1, None),
-                    padding=2,
-                    spacing=2,
-                    color=(0.247, 0.475, 0.424, 1)
-                )
-
-                # Set the container height dynamically
-                container.height = day_scroll_view.height + 120  # ScrollView height + date label height + padding
-                container.add_widget(rounded_box_outter)
-                rounded_box_outter.add_widget(rounded_box)
-
-                # Add the container to the main data container
-                self.data_container.add_widget(container)
+            self.render_log_page(rows)
+        except Exception as e:
+            self.show_error(e)
+
+    def show_load_error(self, error):
+        self.log_list.set_data([])
+        self.show_error(error)
 
+    def load_next_page(self):
+        """Fetch the next page of older logs in the background (one page at a time)."""
+        if not self.has_more_pages or self.loading_page:
+            return
+
+        self.loading_page = True
+        db_executor.submit(fetch_page_before, self.page_cursor,
+                           on_result=self.show_next_page, on_error=self.show_page_error, owner=self)
+
+    def show_next_page(self, rows):
+        self.loading_page = False
+        try:
+            self.render_log_page(rows)
         except Exception as e:
-            self.data_container.add_widget(Label(
-                text=f"Error loading logs: {e}",
-                font_size=18,
-                color=(1, 0, 0, 1),
-                size_hint=(1, None),
-                height=40
-            ))
+            self.show_page_error(e)
+
+    def show_page_error(self, error):
+        self.loading_page = False
+        self.has_more_pages = False
+        self.show_error(error)
+
+    def on_scroll(self, instance, scroll_y):
+        """Fetch older logs once the user scrolls near the end of the list."""
+        if scroll_y <= 0.05 and getattr(self, "has_more_pages", False):
+            self.load_next_page()
+
+    def render_log_page(self, rows):
+        """Turn one page of logs into RecycleView rows, continuing the last day if it spans pages."""
+        self.page_cursor = page_cursor(rows) or self.page_cursor
+        self.has_more_pages = len(rows) >= PAGE_SIZE
+
+        # Define timezone adjustment and formats
+        date_format = "%a %b %d"  # Format for the day header
+        time_format = "%I:%M%p"  # Format for clock-in and clock-out times
+
+        items = []
+        for log_id, employee_name, clock_in, clock_out, status in rows:
+            # Parse and adjust clock-in time
+            clock_in_dt = self.parse_iso_datetime(clock_in)
+            formatted_clock_in = clock_in_dt.strftime(time_format)  # Now shows correct local time
+            clock_in_date = clock_in_dt.strftime(date_format)  # Group by this date
+
+            # Parse and adjust clock-out time if available
+            if clock_out:
+                clock_out_dt = self.parse_iso_datetime(clock_out)
+                formatted_clock_out = clock_out_dt.strftime(time_format)
+            else:
+                formatted_clock_out = "N/A"
+
+            # New day: section header + column headers
+            if clock_in_date != self.last_log_date:
+                items.append(section_row(clock_in_date))
+                items.append(grid_row(LOG_COLUMNS, is_header=True))
+                self.last_log_date = clock_in_date
+
+            items.append(grid_row((employee_name, formatted_clock_in, formatted_clock_out, status or "")))
+
+        if self.log_list.data:
+            self.log_list.append_data(items)
+        else:
+            self.log_list.set_data(items)
+
+    def show_error(self, error):
+        self.log_list.append_data([message_row(f"Error loading logs: {error}", color=(1, 0, 0, 1))])
 
     @staticmethod
     def parse_iso_datetime(iso_string):
@@ -191,5 +165,7 @@ class ClockLogsScreen(Screen):
         self.manager.current = "manager_screen"
 
     def on_leave(self, *args):
-        """Clear all widgets to fully reset the screen when leaving."""
-        self.data_container.clear_widgets()
+        """Drop the loaded rows to fully reset the screen when leaving."""
+        db_executor.cancel_all(self)
+        self.loading_page = False
+        self.log_list.set_data([])
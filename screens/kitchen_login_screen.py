@@ -1,4 +1,4 @@
-import sqlite3, os, json
+import os, json
 from datetime import datetime, timezone
 from kivy.utils import platform
 from kivy.uix.screenmanager import Screen
@@ -9,7 +9,7 @@ from kivy.uix.widget import Widget
 from utils.customboxlayouts import RoundedButton, ColoredBoxLayout
 from utils.global_context import GlobalContext
 from kivy.uix.popup import Popup
-from db.db_initialization import db_path
+from db.connection import get_connection, transaction
 
 
 if platform == "android":
@@ -193,22 +193,19 @@ class KitchenLoginScreen(Screen):
                 self.pin_display.text = ""
                 return
 
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT name FROM cooks WHERE pin = ?", (pin,))
-            result = cursor.fetchone()
+            conn = get_connection()
+            result = conn.execute("SELECT name FROM cooks WHERE pin = ?", (pin,)).fetchone()
 
             if result:
                 employee_name = result[0]
                 self.current_user = employee_name
                 GlobalContext.set_current_user({"name": employee_name, "role": "Cook"})
                 clock_in_time = datetime.now(timezone.utc).isoformat()
-                cursor.execute('''
-                    INSERT INTO clock_logs (employee_name, clock_in_time, status)
-                    VALUES (?, ?, ?)
-                ''', (employee_name, clock_in_time, "Clocked In"))
-                conn.commit()
+                with transaction() as conn:
+                    conn.execute('''
+                        INSERT INTO clock_logs (employee_name, clock_in_time, status)
+                        VALUES (?, ?, ?)
+                    ''', (employee_name, clock_in_time, "Clocked In"))
 
                 # ✅ Check the last logged-in user BEFORE updating
                 last_user = get_last_logged_in()
@@ -224,6 +221,7 @@ class KitchenLoginScreen(Screen):
                 kitchen_screen.cook_name = employee_name
                 kitchen_screen.entered_pin = pin
                 kitchen_screen.cook_label.text = f"[color=#E4E5E9][b]Cook:[/b][/color]\n[color=#818590]{employee_name}[/color]"
+                kitchen_screen.update_stats()  # ✅ Seeds today's stats cache for this cook
                 self.manager.current = "kitchen_panel"
                 self.entered_pin = ""
                 self.pin_display.text = ""
@@ -231,8 +229,6 @@ class KitchenLoginScreen(Screen):
                 self.instruction_label.text = "Invalid PIN. Please try again."
                 self.entered_pin = ""
                 self.pin_display.text = ""
-
-            conn.close()
         except Exception as e:
             print(f"Error in verify_pin: {e}")
             self.instruction_label.text = "An error occurred. Please try again."
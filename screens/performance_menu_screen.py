@@ -1,29 +1,54 @@
 from datetime import timedelta, datetime
 from kivy.uix.screenmanager import Screen
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
-import sqlite3, openpyxl, os, pytz
-from datetime import datetime, timedelta
-from openpyxl.styles import Font
+import os, asynckivy
+from kivy.clock import Clock
 from plyer import storagepath
 from pathlib import Path
 from utils.customboxlayouts import RoundedBoxLayout, RoundedButton, ColoredBoxLayout
-from db.db_initialization import db_path  # ✅ Import the correct path
-
-def convert_utc_to_local(utc_timestamp):
-    """Convert a UTC timestamp to local (EST/EDT) time."""
-    eastern = pytz.timezone("US/Eastern")
-    utc_dt = datetime.strptime(utc_timestamp, "%Y-%m-%d %H:%M:%S").replace(tzinfo=pytz.utc)
-    return utc_dt.astimezone(eastern)  # ✅ Now it returns the converted timestamp
+from utils.widgets import StickyHeaderList, section_row, grid_row, message_row
+from db.executor import db_executor
+from db.result_cache import performance_cache
+from db.analytics import AnalyticsRange, preset_range, stats_by_period, range_totals
+from db.exports import (format_time, write_performance_workbook, write_ticket_workbook, write_tickets_csv,
+                        write_ticket_records, write_clock_logs_csv, write_clock_log_records)
+from utils.range_picker import RangePickerPopup
+
+PERIOD_COLUMNS = ("Cook:", "Shortest:", "Longest:", "Avg:", "P50:", "P90:", "P99:", "Tickets:")
+
+# Export choices: kind -> (button caption, file name prefix, extension, writer)
+EXPORT_KINDS = {
+    "summary": ("Summary (Excel)", "Performance", "xlsx", write_performance_workbook),
+    "tickets": ("Raw Tickets (Excel)", "Tickets", "xlsx", write_ticket_workbook),
+    # ✅ Plain formats for back-office ingestion, much faster than xlsx for big ranges
+    "tickets_csv": ("Raw Tickets (CSV)", "Tickets", "csv", write_tickets_csv),
+    "tickets_records": ("Raw Tickets (Binary)", "Tickets", "ktr", write_ticket_records),
+    "clock_logs_csv": ("Clock Logs (CSV)", "ClockLogs", "csv", write_clock_logs_csv),
+    "clock_logs_records": ("Clock Logs (Binary)", "ClockLogs", "ktr", write_clock_log_records),
+}
+MUTED_TEXT_COLOR = (0.506, 0.522, 0.565, 1)
+
+
+def documents_folder():
+    """Documents folder for exports (with Android fallbacks)."""
+    try:
+        folder = storagepath.get_documents_dir()
+        if folder:
+            return folder
+    except Exception:
+        pass
+    return "/storage/emulated/0/Documents"
 
 
 class PerformanceMenuScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_view = ''
+        self.export_task = None
+        self.view_range = None  # AnalyticsRange of the rows on screen
+        self.custom_cook_name = None  # Cook picked in the range picker (None = all cooks)
 
         # Main Layout
         main_layout = ColoredBoxLayout(orientation="vertical", spacing=10, padding=20, color=(0.118, 0.231, 0.208, 1))
@@ -37,11 +62,8 @@ class PerformanceMenuScreen(Screen):
 
         # Scrollable Middle Content
         scrollable_container = BoxLayout(orientation="vertical", size_hint=(1, 1), padding=10)
-        scroll_view = ScrollView(size_hint=(1, 1), do_scroll_x=False, do_scroll_y=True)
-        self.data_container = BoxLayout(orientation="vertical", spacing=10, size_hint_y=None)
-        self.data_container.bind(minimum_height=self.data_container.setter("height"))
-        scroll_view.add_widget(self.data_container)
-        scrollable_container.add_widget(scroll_view)
+        self.period_list = StickyHeaderList(spacing=2, size_hint=(1, 1))  # Virtualized, period header stays pinned
+        scrollable_container.add_widget(self.period_list)
         main_layout.add_widget(scrollable_container)
 
         # Footer (Buttons)
@@ -50,7 +72,7 @@ class PerformanceMenuScreen(Screen):
         view_selection_toggle = RoundedBoxLayout(orientation="horizontal", size_hint=(1, None), height=150, spacing=10, padding=[8, 0, 8, 0], color=(0.204, 0.408, 0.373, 1))
 
         self.monthly_button = RoundedButton(text="[size=24][b]Month[/b][/size]\n[size=60][font=fonts/MaterialIcons-Regular.ttf]\uefe7[/font][/size]",
-                                            size_hint=(0.25, None), height=130,
+                                            size_hint=(0.2, None), height=130,
                                             on_press=self.load_monthly_data,
                                             background_color=(0.204, 0.408, 0.373, 1),
                                             color=(0.714, 0.569, 0.129, 1),
@@ -59,7 +81,7 @@ class PerformanceMenuScreen(Screen):
         view_selection_toggle.add_widget(self.monthly_button)
 
         self.weekly_button = RoundedButton(text="[size=24][b]Week[/b][/size]\n[size=62][font=fonts/MaterialIcons-Regular.ttf]\uefe8[/font][/size]",
-                                           size_hint=(0.25, None), height=130,
+                                           size_hint=(0.2, None), height=130,
                                            on_press=self.load_weekly_data,
                                            background_color=(0.204, 0.408, 0.373, 1),
                                            color=(0.714, 0.569, 0.129, 1),
@@ -68,7 +90,7 @@ class PerformanceMenuScreen(Screen):
         view_selection_toggle.add_widget(self.weekly_button)
 
         self.daily_button = RoundedButton(text="  [size=24][b]Day[/b][/size]\n[size=62][font=fonts/MaterialIcons-Regular.ttf]\ue8ed[/font][/size]",
-                                          size_hint=(0.25, None), height=130,
+                                          size_hint=(0.2, None), height=130,
                                           on_press=self.load_daily_data,
                                           background_color=(0.204, 0.408, 0.373, 1),
                                           color=(0.714, 0.569, 0.129, 1),
@@ -78,7 +100,7 @@ class PerformanceMenuScreen(Screen):
 
         self.hourly_button = RoundedButton(
             text="[size=24][b]Hour[/b][/size]\n[size=62][font=fonts/MaterialIcons-Regular.ttf]\ue8e9[/font][/size]",
-            size_hint=(0.25, None), height=130,
+            size_hint=(0.2, None), height=130,
             on_press=self.load_hourly_data,
             background_color=(0.204, 0.408, 0.373, 1),
             color=(0.714, 0.569, 0.129, 1),
@@ -86,6 +108,16 @@ class PerformanceMenuScreen(Screen):
         self.hourly_button.pos_hint = {'center_y': 0.5, 'center_x': 0.5}
         view_selection_toggle.add_widget(self.hourly_button)
 
+        self.range_button = RoundedButton(
+            text="[size=24][b]Range[/b][/size]\n[size=62][font=fonts/MaterialIcons-Regular.ttf]\ue916[/font][/size]",
+            size_hint=(0.2, None), height=130,
+            on_press=self.open_range_picker,
+            background_color=(0.204, 0.408, 0.373, 1),
+            color=(0.714, 0.569, 0.129, 1),
+            markup=True)
+        self.range_button.pos_hint = {'center_y': 0.5, 'center_x': 0.5}
+        view_selection_toggle.add_widget(self.range_button)
+
         view_selection_toggle_container.add_widget(view_selection_toggle)
         footer.add_widget(view_selection_toggle_container)
 
@@ -110,7 +142,7 @@ class PerformanceMenuScreen(Screen):
             background_color=(0.373, 0.392, 0.408, 1,),
             markup=True
         )
-        self.export_button.bind(on_press=self.export_to_excel)
+        self.export_button.bind(on_press=self.show_export_options)
 
         # Add buttons to the footer
         main_layout.add_widget(footer)
@@ -130,6 +162,7 @@ class PerformanceMenuScreen(Screen):
         self.weekly_button.set_active(False)
         self.daily_button.set_active(False)
         self.hourly_button.set_active(False)
+        self.range_button.set_active(False)
         self.load_performance_data(group_by="month")
 
     def load_weekly_data(self, instance):
@@ -139,6 +172,7 @@ class PerformanceMenuScreen(Screen):
         self.weekly_button.set_active(True)
         self.daily_button.set_active(False)
         self.hourly_button.set_active(False)
+        self.range_button.set_active(False)
         self.load_performance_data(group_by="week")
 
     def load_daily_data(self, instance):
@@ -148,6 +182,7 @@ class PerformanceMenuScreen(Screen):
         self.weekly_button.set_active(False)
         self.daily_button.set_active(True)
         self.hourly_button.set_active(False)
+        self.range_button.set_active(False)
         self.load_performance_data(group_by="day")
 
     def load_hourly_data(self, instance):
@@ -157,83 +192,88 @@ class PerformanceMenuScreen(Screen):
         self.weekly_button.set_active(False)
         self.daily_button.set_active(False)
         self.hourly_button.set_active(True)
+        self.range_button.set_active(False)
         self.load_performance_data(group_by="hour")
 
-    def load_performance_data(self, group_by="day"):
-        """Fetch and display performance data grouped by the specified period."""
-        self.data_container.clear_widgets()
-
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Get current local time and determine start_date based on selected range
-        local_tz = pytz.timezone("US/Eastern")  # Change to your actual timezone
-        now = datetime.now(local_tz)
-
-        if group_by == "hour":
-            start_date = now - timedelta(days=2)  # Last 2 days of hourly data
-            date_format = "%Y-%m-%d %H:00"
-        elif group_by == "day":
-            start_date = now - timedelta(days=7)  # Last 7 days
-            date_format = "%Y-%m-%d"
-        elif group_by == "week":
-            start_date = now - timedelta(weeks=4)  # Last 4 weeks
-            date_format = "%Y-%W"
-        elif group_by == "month":
-            start_date = now - timedelta(days=90)  # Last 3 months
-            date_format = "%Y-%m"
-        else:
+    def open_range_picker(self, instance):
+        """Load the cook list off the UI thread, then open the custom range picker."""
+        db_executor.submit(lambda conn: conn.execute("SELECT name, pin FROM cooks ORDER BY name").fetchall(),
+                           on_result=self.show_range_picker, on_error=self.show_load_error, owner=self)
+
+    def show_range_picker(self, cooks):
+        current = self.view_range
+        RangePickerPopup(
+            on_apply=self.load_custom_data,
+            cooks=cooks,
+            start=current.start if current else None,
+            end=current.end if current else None,
+            granularity=current.granularity if current else "day",
+            cook_pin=current.cook_pin if current else None,
+        ).open()
+
+    def load_custom_data(self, start, end, granularity, cook_pin, cook_name):
+        self.current_view = "custom"
+        # Set button states correctly
+        self.monthly_button.set_active(False)
+        self.weekly_button.set_active(False)
+        self.daily_button.set_active(False)
+        self.hourly_button.set_active(False)
+        self.range_button.set_active(True)
+        self.custom_cook_name = cook_name
+        self.load_performance_data(granularity, AnalyticsRange(start, end, granularity, cook_pin))
+
+    def load_performance_data(self, group_by="day", analytics_range=None):
+        """Fetch and display performance data for a range (the preset window of `group_by` by default)."""
+        self.period_list.set_data([])
+
+        # ✅ Same window definition as the export (db.analytics.PRESET_WINDOWS)
+        analytics_range = analytics_range or preset_range(group_by)
+        print(f"Filtering for: {group_by} | Range (Local): {analytics_range.start} - {analytics_range.end} | "
+              f"Periods: {analytics_range.start_bucket} - {analytics_range.end_bucket} | Cook: {analytics_range.cook_pin}")
+
+        db_executor.cancel_all(self)  # Only the latest view's query may land
+        key = analytics_range.cache_key
+        self.view_range = analytics_range
+
+        # ✅ Views already loaded since the last ticket/cook change come straight from the cache
+        cached = performance_cache.get(key)
+        if cached is not None:
+            self.show_performance_data(cached, group_by)
             return
 
-        # Convert `start_date` to UTC before filtering the database
-        start_date_utc = start_date.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-
-        print(f"Filtering for: {group_by} | Start Date (Local): {start_date} | Start Date (UTC): {start_date_utc}")
-
-        # Query to pull the correct date range (convert UTC timestamps to local)
-        cursor.execute(f"""
-            SELECT 
-                date AS utc_timestamp,
-                cooks.name AS cook_name,
-                tickets.time_taken
-            FROM tickets
-            INNER JOIN cooks ON cooks.pin = tickets.cook_pin
-            WHERE date >= ?
-            ORDER BY utc_timestamp ASC, cook_name ASC
-        """, (start_date_utc,))
-
-        results = cursor.fetchall()
-        conn.close()
-
-        if not results:
-            self.data_container.add_widget(Label(text="No data found!"))  # Show this if no data
+        # One pre-aggregated row per (period, cook), filtered and sorted in SQL, fetched off the UI thread
+        generation = performance_cache.generation
+        self.data_by_period = {}
+        self.period_list.set_data([message_row("Loading performance data...", color=MUTED_TEXT_COLOR)])
+        db_executor.submit(stats_by_period, analytics_range,
+                           on_result=lambda data: self.cache_performance_data(key, data, generation, group_by),
+                           on_error=self.show_load_error, owner=self)
+
+    def cache_performance_data(self, key, data_by_period, generation, group_by):
+        performance_cache.put(key, data_by_period, generation)
+        self.show_performance_data(data_by_period, group_by)
+
+    def show_load_error(self, error):
+        self.period_list.set_data([message_row(f"Error loading performance data: {error}", color=(1, 0, 0, 1))])
+
+    def show_performance_data(self, data_by_period, group_by):
+        """Display per-period records (shared with the cache, so never modified here)."""
+        self.data_by_period = data_by_period  # Store as a class attribute
+        if not data_by_period:
+            self.period_list.set_data([message_row("No data found!")])  # Show this if no data
             return
 
-        # Process data
-        aggregated_data = {}
-        for utc_timestamp, cook_name, time_taken in results:
-            local_dt = convert_utc_to_local(utc_timestamp)  # Convert from UTC → EST/EDT
-            period = local_dt.strftime(date_format)  # Format the period before filtering
-            key = (period, cook_name)
-            aggregated_data.setdefault(key, []).append(time_taken)
-
-        self.data_by_period = {}  # Store as a class attribute
-        for (period, cook_name), times in aggregated_data.items():
-            fastest_time = min(times)
-            slowest_time = max(times)
-            avg_time = int(sum(times) / len(times))
-            ticket_count = len(times)
-            self.data_by_period.setdefault(period, []).append(
-                (cook_name, fastest_time, slowest_time, avg_time, ticket_count))
-
-        # Sort records by avg_time for each period
-        for period in self.data_by_period:
-            self.data_by_period[period].sort(key=lambda x: x[3])  # Sort by avg_time (index 3 in tuple)
-
-        # Display the sorted data
+        # Display the sorted data as one flat list of recycled rows
+        items = []
+        if len(data_by_period) > 1:
+            # ✅ Whole-range totals per cook; percentiles come from the merged period sketches
+            start_date, end_date = self.view_range.start, self.view_range.end
+            title = f"All Periods | {start_date.strftime('%b %d, %Y')} - {end_date.strftime('%b %d, %Y')}"
+            items.extend(self.aggregated_rows(title, range_totals(data_by_period)))
         for period, records in self.data_by_period.items():
             display_period = self.format_period(period, group_by)
-            self.add_aggregated_grid_item(display_period, records)
+            items.extend(self.aggregated_rows(display_period, records))
+        self.period_list.set_data(items)
 
     def format_period(self, period, group_by):
         """Format the period string for display."""
@@ -254,210 +294,146 @@ class PerformanceMenuScreen(Screen):
             return datetime.strptime(period, "%Y-%m-%d").strftime('%a | %b %d, %Y')
         return period
 
-    def add_aggregated_grid_item(self, period, records):
-        """Add grid layout dynamically with proper spacing and sizing."""
-
-        # Create a grid layout with sufficient spacing
-        grid = GridLayout(cols=5, spacing=10, size_hint_y=None, padding=[20, 10, 20, 10])  # Add padding for grid
-        grid.bind(minimum_height=grid.setter("height"))
-
-        # Add headers to the grid
-        headers = ["Cook:", "Shortest:", "Longest:", "Avg:", "Tickets:"]
-        for header in headers:
-            grid.add_widget(Label(text=header, bold=True, size_hint_y=None, height=40, underline=True, color=(0.506, 0.522, 0.565, 1)))  # Header height remains 40
-
-        # Add records to the grid
-        for cook_name, fastest, slowest, avg, count in records:
-            grid.add_widget(Label(text=cook_name, size_hint_y=None, height=40, color=(0.894, 0.898, 0.914, 1)))
-            grid.add_widget(Label(text=f"{fastest // 60}:{fastest % 60:02}", size_hint_y=None, height=40, color=(0.894, 0.898, 0.914, 1)))
-            grid.add_widget(Label(text=f"{slowest // 60}:{slowest % 60:02}", size_hint_y=None, height=40, color=(0.894, 0.898, 0.914, 1)))
-            grid.add_widget(Label(text=f"{avg // 60}:{avg % 60:02}", size_hint_y=None, height=40, color=(0.894, 0.898, 0.914, 1)))
-            grid.add_widget(Label(text=str(count), size_hint_y=None, height=40, color=(0.894, 0.898, 0.914, 1)))
-
-        # Force layout recalculation for the grid
-        grid.do_layout()
-
-        # Calculate the total height needed for the container
-        total_height = grid.height + 100  # Add space for the period header (50) and padding
-
-        # Create a container for the rounded box (transparent background)
-        container = BoxLayout(orientation="vertical", size_hint_y=None)
-        container.height = total_height
-
-        # Create the rounded box with color and internal padding
-        rounded_box_outter = RoundedBoxLayout(
-            orientation="vertical",
-            size_hint=(1, 1),  # Fills the container
-            color=(0.247, 0.475, 0.424, 1),  # Use the desired color
-            padding=2,
-            spacing=2
-        )
-
-        # Create the rounded box with color and internal padding
-        rounded_box = RoundedBoxLayout(
-            orientation="vertical",
-            size_hint=(1, 1),  # Fills the container
-            color=(0.204, 0.408, 0.373, 1),  # Use the desired color
-            padding=[30, 30, 30, 30],  # Add internal padding
-        )
-
-        # Add a properly sized period label
-        rounded_box.add_widget(
-            Label(text=period, size_hint_y=None, height=50, bold=True, valign="middle", underline=True, color=(0.714, 0.569, 0.129, 1)))  # Period Label
-        rounded_box.add_widget(grid)
-
-        # Add the rounded box to the container
-        rounded_box_outter.add_widget(rounded_box)
-        container.add_widget(rounded_box_outter)
-
-        # Add the container to the main data container
-        self.data_container.add_widget(container)
-        self.data_container.do_layout()
+    def aggregated_rows(self, period, records):
+        """Return the RecycleView rows for one period: title, column headers, then one row per cook."""
+        rows = [section_row(period), grid_row(PERIOD_COLUMNS, is_header=True)]
+        for record in records:
+            rows.append(grid_row((
+                record.cook_name,
+                format_time(record.fastest),
+                format_time(record.slowest),
+                format_time(int(record.average)),
+                format_time(record.p50) if record.p50 is not None else "-",
+                format_time(record.p90) if record.p90 is not None else "-",
+                format_time(record.p99) if record.p99 is not None else "-",
+                str(record.count),
+            )))
+        return rows
 
     def go_back(self, instance):
         """Navigate back to the manager screen."""
         self.manager.current = "manager_screen"
 
-    def export_to_excel(self, instance):
-        """Export current performance data to an Excel file in the Documents folder with a pop-up notification."""
-
-        def show_popup(message):
-            """Displays a pop-up with the given message."""
-            popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
-            label = Label(text=message, size_hint_y=0.7, font_size=30, halign='center', valign='middle')
-            dismiss_button = RoundedButton(text="Dismiss", size_hint_y=None, height=100,
-                                           background_color=(0.541, 0.29, 0.29, 1), color=(0.894, 0.898, 0.914, 1),
-                                           font_size=50)
-            popup_layout.add_widget(label)
-            popup_layout.add_widget(dismiss_button)
-
-            popup = Popup(title="Export Status",
-                          content=popup_layout,
-                          title_size=50,
-                          title_align='center',
-                          size_hint=(0.8, 0.5),
-                          separator_color=(0.169, 0.329, 0.298, 1),
-                          )
-            dismiss_button.bind(on_press=popup.dismiss)
-            popup.open()
-
-        if not hasattr(self, 'data_by_period') or not self.data_by_period:
-            show_popup("No data available for export.")
+    def show_popup(self, message):
+        """Displays a pop-up with the given message."""
+        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        label = Label(text=message, size_hint_y=0.7, font_size=30, halign='center', valign='middle')
+        dismiss_button = RoundedButton(text="Dismiss", size_hint_y=None, height=100,
+                                       background_color=(0.541, 0.29, 0.29, 1), color=(0.894, 0.898, 0.914, 1),
+                                       font_size=50)
+        popup_layout.add_widget(label)
+        popup_layout.add_widget(dismiss_button)
+
+        popup = Popup(title="Export Status",
+                      content=popup_layout,
+                      title_size=50,
+                      title_align='center',
+                      size_hint=(0.8, 0.5),
+                      separator_color=(0.169, 0.329, 0.298, 1),
+                      )
+        dismiss_button.bind(on_press=popup.dismiss)
+        popup.open()
+
+    def show_export_options(self, instance):
+        """Let the manager pick what to export for the range on screen."""
+        if self.export_task is not None and not self.export_task.finished:
+            return  # ✅ One export at a time
+
+        popup_layout = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        popup = Popup(title="Export...",
+                      content=popup_layout,
+                      title_size=50,
+                      title_align='center',
+                      size_hint=(0.8, None),
+                      height=150 + 110 * (len(EXPORT_KINDS) + 1),
+                      separator_color=(0.169, 0.329, 0.298, 1),
+                      )
+        for kind, (caption, _, _, _) in EXPORT_KINDS.items():
+            button = RoundedButton(text=f"[size=40][b]{caption}[/b][/size]", size_hint_y=None, height=100,
+                                   background_color=(0.302, 0.486, 0.443, 1), color=(0.894, 0.898, 0.914, 1),
+                                   markup=True)
+            button.bind(on_press=lambda instance, kind=kind: (popup.dismiss(), self.export_data(kind)))
+            popup_layout.add_widget(button)
+        cancel_button = RoundedButton(text="Cancel", size_hint_y=None, height=100,
+                                      background_color=(0.541, 0.29, 0.29, 1), color=(0.894, 0.898, 0.914, 1),
+                                      font_size=50)
+        cancel_button.bind(on_press=popup.dismiss)
+        popup_layout.add_widget(cancel_button)
+        popup.open()
+
+    def export_data(self, kind):
+        """Export the range on screen to the Documents folder with a pop-up notification."""
+        if self.export_task is not None and not self.export_task.finished:
             return
-
-        def format_time(seconds):
-            """Convert seconds to minute:seconds format."""
-            minutes, seconds = divmod(seconds, 60)
-            return f"{minutes}:{seconds:02d}"
-
-        # ✅ Get correct local and UTC `start_date`
-        local_tz = pytz.timezone("US/Eastern")  # Change to your actual timezone
-        now = datetime.now(local_tz)
-
-        if self.current_view == "daily":
-            start_date = now - timedelta(days=7)
-            date_format = "%Y-%m-%d"
-        elif self.current_view == "weekly":
-            start_date = now - timedelta(days=30)
-            date_format = "%Y-%W"
-        elif self.current_view == "monthly":
-            start_date = now - timedelta(days=90)
-            date_format = "%Y-%m"
-        elif self.current_view == "hourly":
-            start_date = now - timedelta(days=2)  # Last 2 days of hourly data
-            date_format = "%Y-%m-%d %H:00"
-        else:
-            show_popup("Error: Unknown export range.")
+        self.export_task = asynckivy.start(self.run_export(kind))
+
+    def show_export_progress(self, done, total):
+        if not self.export_button.disabled:
+            return  # Export already finished; a late progress update
+        percent = int(100 * done / total) if total else 100
+        self.export_button.text = f"[size=40][b]Exporting... {percent}%[/b][/size]"
+
+    def report_export_progress(self, done, total):
+        """progress() callback for the export writers; they call it from the worker thread."""
+        Clock.schedule_once(lambda dt: self.show_export_progress(done, total))
+
+    async def run_export(self, kind="summary"):
+        """Pick the range on the UI thread, then stream the file out on a DB worker."""
+        analytics_range = self.view_range
+        if analytics_range is None:
+            self.show_popup("Error: Unknown export range.")
             return
 
-        start_date_utc = start_date.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-        # Convert `start_date_utc` to a proper datetime object with UTC timezone
-        start_date_utc = datetime.strptime(start_date_utc, "%Y-%m-%d %H:%M:%S").replace(tzinfo=pytz.utc)
-
+        # ✅ Export exactly the view on screen: same range, same cached rows, no re-filtering
+        start_date, end_date = analytics_range.start, analytics_range.end
+        filtered_data = performance_cache.get(analytics_range.cache_key) or getattr(self, 'data_by_period', None)
 
-        # ✅ Filter `data_by_period` using **correct** `start_date_utc`
-        filtered_data = {}
-        for period, records in self.data_by_period.items():
-            try:
-                # Convert stored period to datetime
-                if self.current_view == "weekly":
-                    year, week = map(int, period.split('-'))
-                    period_date = datetime.strptime(f"{year}-W{week}-1", "%Y-W%W-%w")
-                elif self.current_view == "monthly":
-                    year, month = map(int, period.split('-'))
-                    period_date = datetime(year, month, 1)
-                else:
-                    period_date = datetime.strptime(period, date_format)
-
-                # Convert `period_date` to UTC to compare correctly
-                period_date_utc = period_date.astimezone(pytz.utc)
-
-                if period_date_utc >= start_date_utc:
-                    filtered_data[period] = records
-            except ValueError:
-                continue
-
-        if not filtered_data:
-            show_popup("No data to export within the selected range.")
+        if not filtered_data and not kind.startswith("clock_logs"):
+            self.show_popup("No data available for export.")
             return
 
-        # ✅ Create workbook and worksheet
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Performance Data"
-
-        # ✅ Add title
-        start_date_str = start_date.strftime("%b %d, %Y")
-        now_str = now.strftime("%b %d, %Y")
-        title = f"Performance Data: ({start_date_str} - {now_str})"
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=6)
-        title_cell = ws.cell(row=1, column=1)
-        title_cell.value = title
-        title_cell.font = openpyxl.styles.Font(bold=True, size=16)
-        title_cell.alignment = openpyxl.styles.Alignment(horizontal="center", vertical="center")
-
-        # ✅ Headers
-        headers = ["Period", "Cook", "Shortest", "Longest", "Average", "Tickets"]
-        ws.append(headers)
-        for cell in ws[2]:
-            cell.font = openpyxl.styles.Font(bold=True)
-
-        # ✅ Add filtered data
-        for period, records in filtered_data.items():
-            for record in records:
-                cook_name, fastest_time, slowest_time, avg_time, ticket_count = record
-                ws.append([
-                    period,
-                    cook_name,
-                    format_time(fastest_time),
-                    format_time(slowest_time),
-                    format_time(avg_time),
-                    ticket_count
-                ])
-
-        # ✅ Determine Save Path
+        # ✅ Title and file name
+        _, prefix, extension, writer = EXPORT_KINDS[kind]
+        title = f"{prefix} Data: ({start_date.strftime('%b %d, %Y')} - {end_date.strftime('%b %d, %Y')})"
+        if analytics_range.cook_pin is not None:
+            title += f" - {self.custom_cook_name}"
+        file_name = f"{prefix}_{self.current_view.capitalize()}_{start_date.strftime('%b%d_%Y')}_to_{end_date.strftime('%b%d_%Y')}.{extension}"
+        save_path = Path(documents_folder()) / file_name  # Full path
+
+        # ✅ Progress on the button while the worker streams the file
+        export_text = self.export_button.text
+        self.export_button.text = "[size=40][b]Exporting...[/b][/size]"
+        self.export_button.disabled = True
         try:
-            documents_folder = storagepath.get_documents_dir()
-            if not documents_folder:
-                documents_folder = "/storage/emulated/0/Documents"  # ✅ Fallback for Android
-        except Exception:
-            documents_folder = "/storage/emulated/0/Documents"  # ✅ Another fallback
-
-        # ✅ Generate file name based on current view
-        start_date_file = start_date.strftime("%b%d_%Y")
-        now_file = now.strftime("%b%d_%Y")
-        file_name = f"Performance_{self.current_view.capitalize()}_{start_date_file}_to_{now_file}.xlsx"
-
-        save_path = Path(documents_folder) / file_name  # Full path
-        wb.save(save_path)
+            if kind == "summary":
+                await db_executor.run(writer, filtered_data, analytics_range, title, save_path,
+                                      self.report_export_progress)
+            elif extension == "xlsx":
+                await db_executor.run(writer, analytics_range, title, save_path, self.report_export_progress)
+            else:
+                await db_executor.run(writer, analytics_range, save_path, self.report_export_progress)
+        except Exception as e:
+            self.show_popup(f"Export failed:\n{e}")
+            return
+        finally:
+            self.export_button.text = export_text
+            self.export_button.disabled = False
 
         # ✅ Success message
-        show_popup(f"Saving to:\nFiles/Documents\n\nPlease allow a moment for it to be ready.")
+        self.show_popup(f"Saving to:\nFiles/Documents\n\nPlease allow a moment for it to be ready.")
 
     def on_leave(self, *args):
         """Reset the screen state when leaving."""
-        # Clear the data container
-        self.data_container.clear_widgets()
+        db_executor.cancel_all(self)  # Drop queries still in flight (loaded views stay in performance_cache)
+        if self.export_task is not None and not self.export_task.finished:
+            # No popup on a screen that's gone; run_export's finally still resets the button.
+            # A file already being written on the worker is finished there.
+            self.export_task.cancel()
+        self.export_task = None
+        self.view_range = None
+
+        # Drop the loaded rows
+        self.period_list.set_data([])
 
         # Reset button colors to default
         self.monthly_button.color_instruction.rgba = (0.204, 0.408, 0.373, 1)  # Default background color
@@ -469,6 +445,9 @@ class PerformanceMenuScreen(Screen):
         self.daily_button.color_instruction.rgba = (0.204, 0.408, 0.373, 1)
         self.daily_button.color = (0.714, 0.569, 0.129, 1)
 
+        self.range_button.color_instruction.rgba = (0.204, 0.408, 0.373, 1)
+        self.range_button.color = (0.714, 0.569, 0.129, 1)
+
         # Clear any stored data
         if hasattr(self, 'data_by_period'):
             del self.data_by_period
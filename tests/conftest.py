@@ -0,0 +1,4 @@
+import os, sys
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")  # Keep Kivy (imported by db_initialization) away from pytest's flags
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,110 @@
+import pytest
+import db.db_initialization as db_initialization
+from db.connection import configure_journal_mode, get_connection, close_all
+from db.migrations import migrate, get_schema_version, LATEST_VERSION, MIGRATIONS
+from db.rollups import rebuild_rollups, rollups_query
+from db.stats_cache import COOK_DAY_STATS_SQL
+from db.clock_logs import (RECENT_LOGS_SQL, NEWEST_PAGE_SQL, PAGE_BEFORE_SQL, LATEST_OPEN_SHIFT_SQL,
+                           OPEN_SHIFT_FOR_COOK_SQL)
+from db.aggregation import ticket_times_query
+from db.time_buckets import BUCKET_COLUMNS
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    """A fully migrated database in a temp folder."""
+    monkeypatch.setattr(db_initialization, "db_path", str(tmp_path / "kitchen_tracker.db"))
+    close_all()  # Drop connections to any other database
+    configure_journal_mode()
+    migrate()
+    yield get_connection()
+    close_all()
+
+
+@pytest.fixture
+def legacy_conn(tmp_path, monkeypatch):
+    """A schema v4 database (text-dated tickets, no rollups yet) in a temp folder."""
+    monkeypatch.setattr(db_initialization, "db_path", str(tmp_path / "kitchen_tracker.db"))
+    close_all()
+    conn = get_connection()
+    for version, _, steps in MIGRATIONS[:4]:
+        for step in steps:
+            conn.execute(step)
+    conn.execute("PRAGMA user_version = 4")
+    conn.executemany("INSERT INTO cooks (pin, name) VALUES (?, ?)", [(1111, "Ana"), (2222, "Ben")])
+    conn.executemany("INSERT INTO tickets (cook_pin, date, time_taken) VALUES (?, ?, ?)", [
+        (1111, "2025-03-09 06:30:00", 300),  # Across the spring DST change in New York
+        (1111, "2025-03-09 07:30:00", 420),
+        (2222, "2025-03-09 07:45:00", 90),
+        (2222, "2025-12-31 23:59:59", 600),  # Still Dec 31st locally
+    ])
+    yield conn
+    close_all()
+
+
+def query_plan(conn, query, params=()):
+    return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+
+def test_migrate_reaches_latest_version(conn):
+    assert get_schema_version(conn) == LATEST_VERSION
+    migrate()  # Re-running is a no-op
+    assert get_schema_version(conn) == LATEST_VERSION
+
+
+def test_cook_day_stats_use_cook_index(conn):
+    # DailyStatsCache.seed: one cook, one business-day range (KitchenPanel header)
+    plan = query_plan(conn, COOK_DAY_STATS_SQL, (1234, 0, 86400))
+    assert "USING INDEX idx_tickets_cook_logged_at" in plan
+
+
+def test_open_clock_log_lookup_uses_partial_index(conn):
+    # TicketApp.restore_logged_in_user: latest open shift
+    plan = query_plan(conn, LATEST_OPEN_SHIFT_SQL)
+    assert "USING INDEX idx_clock_logs_open" in plan
+
+
+def test_open_clock_log_by_name_uses_partial_index(conn):
+    # KitchenPanel.log_clock_out: open shift for one cook
+    plan = query_plan(conn, OPEN_SHIFT_FOR_COOK_SQL, ("Ann",))
+    assert "USING INDEX idx_clock_logs_open_by_name" in plan
+
+
+@pytest.mark.parametrize("query, params", [
+    (RECENT_LOGS_SQL, ("2025-01-01T00:00:00+00:00",)),
+    (NEWEST_PAGE_SQL, (50,)),
+    (PAGE_BEFORE_SQL, ("2025-01-01T00:00:00+00:00", 10, 50)),
+])
+def test_clock_log_pages_walk_in_time_index(conn, query, params):
+    # ClockLogsScreen paging (db/clock_logs.py), newest first without a sort
+    plan = query_plan(conn, query, params)
+    assert "idx_clock_logs_in_time" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize("granularity", sorted(BUCKET_COLUMNS))
+def test_spread_stats_stream_off_covering_index(conn, granularity):
+    # db/aggregation.py iter_grouped_stats: raw tickets for the export's spread columns, in group order
+    query, params = ticket_times_query(granularity, "2025-01", "2025-03")
+    plan = query_plan(conn, query, params)
+    assert f"USING COVERING INDEX idx_tickets_{granularity}_bucket" in plan
+    assert "TEMP B-TREE" not in plan  # Already grouped, no sort
+
+
+def test_performance_rollups_use_primary_key(conn):
+    # load_rollups: the per-period rows behind the performance screen
+    plan = query_plan(conn, *rollups_query("day", "2025-01-01", "2025-01-31"))
+    assert "SEARCH r USING PRIMARY KEY" in plan
+
+
+def test_upgrade_from_v4_backfills_rollups(legacy_conn):
+    migrate()
+    assert get_schema_version(legacy_conn) == LATEST_VERSION
+
+    query = "SELECT * FROM ticket_rollups ORDER BY granularity, bucket, cook_pin"
+    upgraded = legacy_conn.execute(query).fetchall()
+    rebuild_rollups(legacy_conn)
+    assert upgraded == legacy_conn.execute(query).fetchall()
+    assert legacy_conn.execute(
+        "SELECT ticket_count FROM ticket_rollups WHERE granularity = 'day' AND bucket = '2025-12-31'"
+    ).fetchone() == (1,)
@@ -7,6 +7,11 @@ from kivy.app import App
 from kivy.uix.button import Button
 from kivy.uix.widget import Widget
 from kivy.uix.image import Image
+from kivy.utils import get_hex_from_color
+from utils.texture_cache import label_texture
+
+ICON_FONT = "fonts/MaterialIcons-Regular.ttf"  # Buttons whose markup uses it are icon + caption
+
 
 class ColoredBoxLayout(BoxLayout):
     def __init__(self, color=(1, 1, 1, 1), **kwargs):
@@ -151,6 +156,32 @@ class RoundedButton(Button):
             self.color_instruction.rgba = self.default_bg_color  # Reset background when not active
             self.color = self.default_text_color  # Reset text color
 
+    def texture_update(self, *largs):
+        """Icon + caption markup comes from the shared texture cache.
+
+        The same icon buttons are rebuilt for every popup and menu, and the
+        text color flips with state, so each distinct caption is rasterized once
+        per process instead of once per button per change. Anything else (plain
+        text, refs/anchors, shortening) goes through the regular Label path.
+        """
+        if not self._is_icon_caption():
+            return super().texture_update(*largs)
+        color = self.disabled_color if self.disabled else self.color
+        text = f"[color={get_hex_from_color(color)}]{self.text}[/color]"
+        self.texture = label_texture(
+            text, font_size=self.font_size, font_name=self.font_name, bold=self.bold, italic=self.italic,
+            halign=self.halign, valign=self.valign, text_size=self.text_size, padding=self.padding,
+            line_height=self.line_height,
+        )
+        self.texture_size = list(self.texture.size)
+        self.is_shortened = False
+        self.refs, self.anchors = {}, {}
+
+    def _is_icon_caption(self):
+        text = self.text
+        return (self.markup and not self.shorten and f"[font={ICON_FONT}]" in text
+                and "[ref=" not in text and "[anchor=" not in text)
+
     def _get_darker_duller_color(self, color):
         """Make the color darker and duller for the disabled state."""
         luminance = sum(color[:3]) / 3
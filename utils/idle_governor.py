@@ -0,0 +1,108 @@
+import time
+from kivy.clock import Clock
+from kivy.config import Config
+from kivy.core.window import Window
+
+ACTIVE = "active"
+IDLE = "idle"
+
+IDLE_FPS = 10  # Frame cap while idle; also bounds how long a touch waits to be picked up (100 ms)
+IDLE_DELAY = 15  # Seconds without input (and nothing busy) before dropping to IDLE_FPS
+
+# Kivy reads graphics.maxfps from Config only once, when the Clock is created, and
+# has no public setter; the live cap is the private Clock._max_fps, re-read on every
+# frame (checked against Kivy 2.3.1, pinned in requirements.txt). If a Kivy upgrade
+# drops it, the governor only tracks active/idle time and never throttles.
+CAN_THROTTLE = hasattr(Clock, "_max_fps")
+
+
+class IdleGovernor:
+    """Drops the Kivy frame rate while the tablet is sitting idle.
+
+    The app is active while any busy check reports work (e.g. a running ticket)
+    or for IDLE_DELAY seconds after the last touch or key press; otherwise the
+    Clock is capped at IDLE_FPS. Any input, screen change or ticket event calls
+    wake(), which restores the full frame rate on the very next frame. Scheduled
+    Clock events (like the per-second ticker) keep firing in both modes; while
+    idle they can only land up to one idle frame late.
+    """
+
+    def __init__(self, idle_fps=IDLE_FPS, idle_delay=IDLE_DELAY):
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self.active_fps = None  # Configured maxfps, captured on start()
+        self.mode = ACTIVE
+        self.mode_since = time.monotonic()
+        self.mode_seconds = {ACTIVE: 0.0, IDLE: 0.0}
+        self.switches = 0
+        self._busy_checks = []
+        self._last_activity = time.monotonic()
+        self._event = None
+
+    def start(self):
+        if CAN_THROTTLE:
+            self.active_fps = float(Config.getint("graphics", "maxfps"))
+        else:
+            print("IdleGovernor: Clock has no _max_fps on this Kivy version; idle throttling is off")
+        Window.bind(on_touch_down=self.on_input, on_touch_move=self.on_input,
+                    on_touch_up=self.on_input, on_key_down=self.on_input)
+        self.wake()
+
+    def stop(self):
+        Window.unbind(on_touch_down=self.on_input, on_touch_move=self.on_input,
+                      on_touch_up=self.on_input, on_key_down=self.on_input)
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self._switch(ACTIVE)
+
+    def add_busy_check(self, check):
+        """Register a callable; while any returns True the governor never goes idle."""
+        self._busy_checks.append(check)
+
+    def on_input(self, *args):
+        self.wake()
+        # Returns None so the touch/key continues to the widgets
+
+    def wake(self):
+        """Note activity and go back to the full frame rate if idle."""
+        self._last_activity = time.monotonic()
+        self._switch(ACTIVE)
+        if self._event is None:
+            self._event = Clock.schedule_once(self._check_idle, self.idle_delay)
+
+    def _check_idle(self, dt):
+        self._event = None
+        remaining = self._last_activity + self.idle_delay - time.monotonic()
+        if remaining > 0:
+            self._event = Clock.schedule_once(self._check_idle, remaining)
+        elif any(check() for check in self._busy_checks):
+            self._event = Clock.schedule_once(self._check_idle, self.idle_delay)
+        else:
+            self._switch(IDLE)
+
+    def _switch(self, mode):
+        if mode == self.mode:
+            return
+        now = time.monotonic()
+        self.mode_seconds[self.mode] += now - self.mode_since
+        self.mode, self.mode_since = mode, now
+        self.switches += 1
+        if self.active_fps is not None:  # Only set on start() when CAN_THROTTLE
+            Clock._max_fps = self.idle_fps if mode == IDLE else self.active_fps
+
+    def time_in_modes(self):
+        """Seconds spent in each mode so far, including the current stretch."""
+        seconds = dict(self.mode_seconds)
+        seconds[self.mode] += time.monotonic() - self.mode_since
+        return seconds
+
+    def summary(self):
+        seconds = self.time_in_modes()
+        total = sum(seconds.values()) or 1
+        return (f"active {seconds[ACTIVE]:.0f}s ({seconds[ACTIVE] / total:.0%}), "
+                f"idle {seconds[IDLE]:.0f}s ({seconds[IDLE] / total:.0%}), {self.switches} switches")
+
+
+# ✅ Shared frame-rate governor, started by the app
+idle_governor = IdleGovernor()
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.spinner import Spinner
+from utils.customboxlayouts import RoundedButton
+from db.time_buckets import LOCAL_TIMEZONE
+
+GRANULARITY_LABELS = (("hour", "Hour"), ("day", "Day"), ("week", "Week"), ("month", "Month"))
+ALL_COOKS = "All Cooks"
+TEXT_COLOR = (0.894, 0.898, 0.914, 1)
+STEP_COLOR = (0.204, 0.408, 0.373, 1)
+GRANULARITY_COLOR = (0.302, 0.486, 0.443, 1)
+
+
+class RangePickerPopup(Popup):
+    """Pick a custom performance range: from/to days, a granularity and an optional cook.
+
+    on_apply(start, end, granularity, cook_pin, cook_name) gets aware local
+    datetimes covering whole days (start at midnight, end at 23:59:59).
+    """
+
+    def __init__(self, on_apply, cooks=(), start=None, end=None, granularity="day", cook_pin=None, **kwargs):
+        self.on_apply = on_apply
+        today = datetime.now(LOCAL_TIMEZONE).date()
+        self.end_day = (end.date() if end else today)
+        self.start_day = (start.date() if start else self.end_day - timedelta(days=6))
+        self.granularity = granularity
+        self.cook_pins = {name: pin for name, pin in cooks}
+
+        content = BoxLayout(orientation="vertical", spacing=15, padding=(10, 20, 10, 10))
+        super().__init__(
+            title="Select a custom range...",
+            title_size=30,
+            title_align="center",
+            content=content,
+            size_hint=(0.9, None),
+            height=900,
+            auto_dismiss=False,
+            separator_color=(0.169, 0.329, 0.298, 1),
+            **kwargs
+        )
+
+        self.start_label = self.add_day_row(content, "From:", "start_day")
+        self.end_label = self.add_day_row(content, "To:", "end_day")
+
+        # Granularity toggle
+        granularity_row = BoxLayout(orientation="horizontal", size_hint_y=None, height=100, spacing=10)
+        self.granularity_buttons = {}
+        for value, text in GRANULARITY_LABELS:
+            button = RoundedButton(text=f"[size=30][b]{text}[/b][/size]", markup=True,
+                                   background_color=GRANULARITY_COLOR, color=TEXT_COLOR)
+            button.bind(on_release=lambda instance, value=value: self.set_granularity(value))
+            self.granularity_buttons[value] = button
+            granularity_row.add_widget(button)
+        content.add_widget(granularity_row)
+        self.set_granularity(granularity)
+
+        # Optional cook filter
+        selected_cook = next((name for name, pin in cooks if pin == cook_pin), ALL_COOKS)
+        self.cook_spinner = Spinner(text=selected_cook, values=[ALL_COOKS] + [name for name, _ in cooks],
+                                    size_hint_y=None, height=100, font_size=35,
+                                    background_normal="", background_color=STEP_COLOR)
+        content.add_widget(self.cook_spinner)
+
+        # Cancel / Apply
+        actions = BoxLayout(orientation="horizontal", size_hint_y=None, height=110, spacing=10)
+        cancel_button = RoundedButton(
+            text="[font=fonts/MaterialIcons-Regular.ttf][size=45]\ue5cd[/size][/font]   [size=40][b]Cancel[/b][/size]",
+            background_color=(0.541, 0.29, 0.29, 1), color=(1, 1, 1, 1), markup=True)
+        cancel_button.bind(on_release=lambda instance: self.dismiss())
+        apply_button = RoundedButton(
+            text="[font=fonts/MaterialIcons-Regular.ttf][size=45]\ue876[/size][/font]   [size=40][b]Apply[/b][/size]",
+            background_color=(0.302, 0.486, 0.443, 1), color=(1, 1, 1, 1), markup=True)
+        apply_button.bind(on_release=self.apply)
+        actions.add_widget(cancel_button)
+        actions.add_widget(apply_button)
+        content.add_widget(actions)
+
+    def add_day_row(self, content, title, attr):
+        """A "From:"/"To:" row with week/day steppers around the selected date."""
+        row = BoxLayout(orientation="horizontal", size_hint_y=None, height=100, spacing=8)
+        row.add_widget(Label(text=f"[b]{title}[/b]", markup=True, font_size=32, size_hint_x=0.16, color=TEXT_COLOR))
+        label = Label(font_size=32, size_hint_x=0.36, color=TEXT_COLOR)
+        for text, days in (("-7", -7), ("-1", -1), (None, 0), ("+1", 1), ("+7", 7)):
+            if text is None:
+                row.add_widget(label)
+                continue
+            button = RoundedButton(text=f"[size=30][b]{text}[/b][/size]", markup=True, size_hint_x=0.12,
+                                   background_color=STEP_COLOR, color=TEXT_COLOR)
+            button.bind(on_release=lambda instance, days=days: self.step(attr, days))
+            row.add_widget(button)
+        content.add_widget(row)
+        label.text = getattr(self, attr).strftime("%a %b %d, %Y")
+        return label
+
+    def step(self, attr, days):
+        """Move one end of the range, never past today or the other end."""
+        today = datetime.now(LOCAL_TIMEZONE).date()
+        day = min(getattr(self, attr) + timedelta(days=days), today)
+        if attr == "start_day":
+            self.start_day = min(day, self.end_day)
+        else:
+            self.end_day = max(day, self.start_day)
+        self.start_label.text = self.start_day.strftime("%a %b %d, %Y")
+        self.end_label.text = self.end_day.strftime("%a %b %d, %Y")
+
+    def set_granularity(self, granularity):
+        self.granularity = granularity
+        for value, button in self.granularity_buttons.items():
+            button.set_active(value == granularity)
+
+    def apply(self, instance):
+        start = LOCAL_TIMEZONE.localize(datetime.combine(self.start_day, datetime.min.time()))
+        end = LOCAL_TIMEZONE.localize(datetime.combine(self.end_day, datetime.max.time().replace(microsecond=0)))
+        cook_name = self.cook_spinner.text
+        cook_pin = self.cook_pins.get(cook_name)
+        self.dismiss()
+        self.on_apply(start, end, self.granularity, cook_pin, None if cook_pin is None else cook_name)
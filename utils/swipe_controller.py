@@ -0,0 +1,79 @@
+SWIPE_THRESHOLD = 20  # Horizontal px per move event that counts as a swipe
+
+
+class SwipeController:
+    """Single swipe-gesture dispatcher for the KitchenPanel ticket list.
+
+    Bound once to the ticket RecycleView instead of every row binding its own
+    on_touch_move. The row under a touch is resolved once on touch-down (from
+    the handful of on-screen views) and stored on the touch, so each move
+    event costs the same however many tickets are open. Reveal state lives
+    here, keyed by ticket id, and only one row is revealed at a time.
+    """
+
+    def __init__(self, panel, recycle_view):
+        self.panel = panel
+        self.recycle_view = recycle_view
+        self.revealed_ticket_id = None
+        recycle_view.bind(on_touch_down=self.on_touch_down, on_touch_move=self.on_touch_move)
+
+    def ticket_at(self, pos):
+        """Return the ticket id of the on-screen row under a point (in the RecycleView's parent coordinates)."""
+        pos = self.recycle_view.to_local(*pos)  # Rows live in the scrolled viewport's coordinates
+        for row in self.recycle_view.layout_manager.children:
+            if row.collide_point(*pos):
+                return row.ticket_id
+        return None
+
+    def on_touch_down(self, instance, touch):
+        if "swipe_ticket" not in touch.ud and self.recycle_view.collide_point(*touch.pos):
+            touch.ud["swipe_ticket"] = self.ticket_at(touch.pos)
+        return False  # Let the RecycleView scroll / deliver the touch as usual
+
+    def on_touch_move(self, instance, touch):
+        """Reveal or hide actions on horizontal drags; vertical drags fall through to scrolling."""
+        ticket_id = touch.ud.get("swipe_ticket")
+        if ticket_id is None:
+            return False
+        ticket = self.panel.tickets.get(ticket_id)
+        if ticket is None or not ticket.running:
+            return False
+
+        if abs(touch.dx) > abs(touch.dy):  # If horizontal movement is greater, trigger swipe
+            if touch.dx < -SWIPE_THRESHOLD:  # Swipe left to reveal buttons
+                self.reveal(ticket_id)
+                touch.ud["swiped"] = True
+            elif touch.dx > SWIPE_THRESHOLD:  # Swipe right to hide buttons
+                self.hide(ticket_id)
+                touch.ud["swiped"] = True
+            return True  # Consume event for swiping
+        return False
+
+    def is_revealed(self, ticket_id):
+        return self.revealed_ticket_id == ticket_id
+
+    def reveal(self, ticket_id):
+        """Reveal one ticket's actions, collapsing whichever row was open before."""
+        if self.revealed_ticket_id == ticket_id:
+            return
+        if self.revealed_ticket_id is not None:
+            self.hide(self.revealed_ticket_id)
+        self.revealed_ticket_id = ticket_id
+        row = self._row(ticket_id)
+        if row is not None:
+            row.animate_actions(True)
+
+    def hide(self, ticket_id):
+        """Collapse a ticket's actions, whether or not its row is on screen."""
+        if self.revealed_ticket_id == ticket_id:
+            self.revealed_ticket_id = None
+        row = self._row(ticket_id)
+        if row is not None:
+            row.animate_actions(False)
+
+    def reset(self):
+        self.revealed_ticket_id = None
+
+    def _row(self, ticket_id):
+        ticket = self.panel.tickets.get(ticket_id)
+        return ticket.widget if ticket is not None else None
@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from kivy.core.text import Label as CoreLabel
+from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
+from kivy.graphics.texture import Texture
+
+TIMER_GLYPHS = "0123456789:"
+MAX_LABEL_TEXTURES = 256  # Captions, icons and ticket states; plenty for every screen
+
+
+class GlyphAtlas:
+    """A fixed set of characters rasterized once and packed side by side into one texture.
+
+    Each character is handed out as a region of the shared atlas, so text made
+    only of these characters (like a ticket's elapsed time) is composed from
+    rectangles instead of being run through the text renderer again. Digits
+    share one cell width so the text doesn't jitter as it counts.
+    """
+
+    def __init__(self, chars, font_size=30, font_name="Roboto", bold=False):
+        rendered = []
+        for char in chars:
+            label = CoreLabel(text=char, font_size=font_size, font_name=font_name, bold=bold, color=(1, 1, 1, 1))
+            label.refresh()
+            rendered.append((char, label.texture))
+
+        width = sum(texture.width for _, texture in rendered)
+        self.height = max(texture.height for _, texture in rendered)
+        self.texture = Texture.create(size=(width, self.height), colorfmt="rgba")
+        self.texture.blit_buffer(bytes(width * self.height * 4), colorfmt="rgba", bufferfmt="ubyte")
+
+        self.glyphs = {}
+        x = 0
+        for char, texture in rendered:
+            # Label textures are stored top row first; the atlas keeps that layout and is flipped once below
+            self.texture.blit_buffer(texture.pixels, pos=(x, 0), size=texture.size, colorfmt="rgba", bufferfmt="ubyte")
+            self.glyphs[char] = (x, texture.width, texture.height)
+            x += texture.width
+        self.texture.flip_vertical()
+
+        self.regions = {char: self.texture.get_region(x, 0, glyph_width, glyph_height)
+                        for char, (x, glyph_width, glyph_height) in self.glyphs.items()}
+        self.cell_width = max([glyph_width for char, (_, glyph_width, _) in self.glyphs.items() if char.isdigit()] or [0])
+
+    def advance(self, char):
+        """Horizontal space a character takes in composed text."""
+        return self.cell_width if char.isdigit() else self.glyphs[char][1]
+
+    def measure(self, text):
+        return sum(self.advance(char) for char in text)
+
+    def layout(self, text, x, y):
+        """Yield (texture, pos, size) for each character of text, starting at (x, y)."""
+        for char in text:
+            glyph_width, glyph_height = self.glyphs[char][1:]
+            cell = self.advance(char)
+            yield self.regions[char], (int(x + (cell - glyph_width) / 2), int(y)), (glyph_width, glyph_height)
+            x += cell
+
+
+_atlases = {}
+_label_textures = OrderedDict()
+
+
+def glyph_atlas(chars=TIMER_GLYPHS, font_size=30, font_name="Roboto", bold=False):
+    """Shared atlas for a character set, built on first use (needs the GL context)."""
+    key = (chars, font_size, font_name, bold)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(chars, font_size, font_name, bold)
+    return atlas
+
+
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def label_texture(markup, **options):
+    """Rasterize markup once per distinct (markup, options) and share the texture between widgets.
+
+    Each entry gets its own label so no widget's later re-render can overwrite
+    a texture that other widgets are still drawing. Least recently used entries
+    are dropped past MAX_LABEL_TEXTURES.
+    """
+    options.pop("text", None)
+    options.pop("font_name_r", None)  # Derived from font_name by the provider
+    key = (markup, tuple(sorted((name, _freeze(value)) for name, value in options.items())))
+
+    texture = _label_textures.get(key)
+    if texture is not None:
+        _label_textures.move_to_end(key)
+        return texture
+
+    label = CoreMarkupLabel(text=markup, **options)
+    label.refresh()
+    texture = label.texture
+    _label_textures[key] = texture
+    if len(_label_textures) > MAX_LABEL_TEXTURES:
+        _label_textures.popitem(last=False)
+    return texture
@@ -0,0 +1,59 @@
+import time
+from kivy.clock import Clock
+
+
+class SecondTicker:
+    """One shared Clock event that fires just after every wall-clock second.
+
+    Open tickets register a callback under their ticket id instead of each
+    scheduling its own interval. Registering and unregistering are a single
+    dict operation, each tick walks only the registered (running) entries,
+    and the Clock event is dropped entirely while nothing is registered.
+    """
+
+    def __init__(self, offset=0.005):
+        self.offset = offset  # Land slightly after the boundary so int(elapsed) has already rolled
+        self._callbacks = {}
+        self._event = None
+        self._target = None  # Wall-clock time the pending tick is due
+
+    def __len__(self):
+        return len(self._callbacks)
+
+    def __contains__(self, key):
+        return key in self._callbacks
+
+    def register(self, key, callback):
+        """Call callback(now) every second until unregistered; re-registering a key replaces it."""
+        self._callbacks[key] = callback
+        if self._event is None:
+            self._schedule_next()
+
+    def unregister(self, key):
+        """Stop ticking for one key (no-op if it isn't registered)."""
+        self._callbacks.pop(key, None)
+        if not self._callbacks and self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def _schedule_next(self):
+        now = time.time()
+        self._target = now - (now % 1) + 1 + self.offset
+        self._event = Clock.schedule_once(self._tick, self._target - now)
+
+    def _tick(self, dt):
+        self._event = None
+        now = time.time()
+        if now < self._target - self.offset:
+            # The Clock may fire up to a frame early (a whole idle frame when throttled); wait out the boundary
+            self._event = Clock.schedule_once(self._tick, self._target - now)
+            return
+        # Snapshot so callbacks may unregister themselves mid-walk
+        for callback in list(self._callbacks.values()):
+            callback(now)
+        if self._callbacks and self._event is None:
+            self._schedule_next()
+
+
+# ✅ Shared ticker for every open-ticket timer
+ticker = SecondTicker()
@@ -0,0 +1,95 @@
+import time
+
+RUNNING = "running"
+SOLD = "sold"
+CANCELED = "canceled"
+
+
+class OpenTicket:
+    """One ticket on the kitchen board."""
+    __slots__ = ("ticket_id", "cook_pin", "opened_at", "started", "state", "time_taken", "handed_off_to", "widget")
+
+    def __init__(self, ticket_id, cook_pin, opened_at, started, widget=None):
+        self.ticket_id = ticket_id
+        self.cook_pin = cook_pin
+        self.opened_at = opened_at  # Wall-clock epoch seconds, for persisting across restarts
+        self.started = started  # time.monotonic() anchor used for elapsed time
+        self.state = RUNNING
+        self.time_taken = None  # Final elapsed seconds, set when the ticket is closed
+        self.handed_off_to = None  # Cook name shown after a hand-off
+        self.widget = widget  # Row view currently displaying this ticket (None while off-screen)
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    def elapsed(self, now=None):
+        """Whole seconds since the ticket was opened (monotonic, immune to clock changes)."""
+        return int((now or time.monotonic()) - self.started)
+
+
+class TicketRegistry:
+    """The tickets currently on one KitchenPanel board.
+
+    Running tickets are also indexed separately, so "is anything running" is a
+    dict check, and elapsed lookups and the resume re-anchoring touch only the
+    running tickets.
+    """
+
+    def __init__(self):
+        self._tickets = {}
+        self._running = {}
+        self._last_id = 0
+
+    def __len__(self):
+        return len(self._tickets)
+
+    def __iter__(self):
+        return iter(self._tickets.values())
+
+    def get(self, ticket_id):
+        return self._tickets.get(ticket_id)
+
+    @property
+    def has_running(self):
+        return bool(self._running)
+
+    def open(self, cook_pin, opened_at=None, ticket_id=None):
+        """Add a running ticket; opened_at lets a restored ticket keep its original start."""
+        if ticket_id is None:
+            ticket_id = self._last_id + 1
+        self._last_id = max(self._last_id, ticket_id)
+
+        now = time.time()
+        opened_at = now if opened_at is None else opened_at
+        ticket = OpenTicket(ticket_id, cook_pin, opened_at, time.monotonic() - max(now - opened_at, 0))
+        self._tickets[ticket_id] = ticket
+        self._running[ticket_id] = ticket
+        return ticket
+
+    def close(self, ticket_id, state=SOLD):
+        """Mark a running ticket sold/canceled; returns the ticket, or None if it wasn't running."""
+        ticket = self._running.pop(ticket_id, None)
+        if ticket is not None:
+            ticket.time_taken = ticket.elapsed()
+            ticket.state = state
+        return ticket
+
+    def elapsed(self, ticket_id, now=None):
+        """Elapsed seconds of a running ticket (0 if unknown or already closed)."""
+        ticket = self._running.get(ticket_id)
+        return ticket.elapsed(now) if ticket is not None else 0
+
+    def running_tickets(self):
+        return list(self._running.values())
+
+    def reanchor(self):
+        """Re-derive monotonic anchors from wall-clock starts (monotonic time may stop while suspended)."""
+        now, mono = time.time(), time.monotonic()
+        for ticket in self._running.values():
+            ticket.started = mono - max(now - ticket.opened_at, 0)
+
+    def clear(self):
+        # Ids keep counting up so a stale row widget can never act on a newer ticket
+        self._tickets.clear()
+        self._running.clear()
@@ -0,0 +1,288 @@
+from kivy.uix.widget import Widget
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.animation import Animation
+from kivy.graphics import Color, Rectangle, RoundedRectangle, InstructionGroup
+from kivy.properties import NumericProperty, ObjectProperty
+from utils.ticket_registry import SOLD, CANCELED
+from utils.texture_cache import glyph_atlas, label_texture
+
+OPEN_TEXT_COLOR = (0.894, 0.898, 0.914, 1)
+CLOSED_TEXT_COLOR = (0.506, 0.522, 0.565, 1)
+DISABLED_TEXT_COLOR = (0.7, 0.7, 0.7, 1)
+BORDER_COLOR = (0.247, 0.475, 0.424, 1)
+CARD_COLOR = (0.204, 0.408, 0.373, 1)
+ORDER_COLOR = (0.714, 0.569, 0.129, 1)
+HAND_OFF_COLOR = (0.651, 0.4, 0.267, 1)
+CANCEL_COLOR = (0.541, 0.29, 0.29, 1)
+
+RADIUS = 30
+ACTIONS_WIDTH = 235
+ACTION_BUTTON_SIZE = (110, 120)
+
+ORDER_TEXT = "[font=fonts/MaterialIcons-Regular.ttf][size=60]\ueb49[/size][/font]\n[size=30][b]Order[/b][/size]"
+HAND_OFF_TEXT = "[size=20][b]Hand Off[/b][/size]\n[font=fonts/MaterialIcons-Regular.ttf][size=60]\ue769[/size][/font]"
+CANCEL_TEXT = "[size=20][b]Cancel[/b][/size]\n[font=fonts/MaterialIcons-Regular.ttf][size=70]\ue872[/size][/font]"
+TIMER_HEADING = "[b][u]Time:[/u][/b]"
+
+
+def format_elapsed(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def render_text(text, font_size=30, bold=False):
+    """Cached white texture for markup; the canvas Color in front of it tints it."""
+    return label_texture(text, font_size=font_size, bold=bold, halign="center", color=(1, 1, 1, 1))
+
+
+def dull(color):
+    """Darker, duller variant of a color for disabled buttons (same formula as RoundedButton)."""
+    luminance = sum(color[:3]) / 3
+    return tuple(channel * 0.75 + (luminance - channel) * 0.25 for channel in color[:3]) + (color[3],)
+
+
+def darken(color, factor=0.9):
+    return (color[0] * factor, color[1] * factor, color[2] * factor, color[3])
+
+
+class TicketRow(RecycleDataViewBehavior, Widget):
+    """Flat, canvas-drawn KitchenPanel ticket row.
+
+    Border, card, labels and the Order / Hand Off / Cancel buttons are plain
+    instructions in one InstructionGroup, with no child widgets, stencils or nested
+    layouts, and touches are hit-tested against the button rectangles here.
+    The RecycleView rebinds rows to other tickets while scrolling, so all
+    display state is read back from the ticket record in the panel's registry.
+    """
+    ticket_id = NumericProperty(0)
+    panel = ObjectProperty(None, allownone=True)
+    reveal = NumericProperty(0)  # Width of the swiped-open action area (animated)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.ticket = None
+        self.pressed = None  # Name of the button region under an active press
+        self.regions = {}  # Button name -> (x, y, width, height)
+        self.ticket_text_value = None
+        self.timer_text_value = None
+        self.timer_rects = []
+
+        self.group = InstructionGroup()
+        self.border_color = Color(*BORDER_COLOR)
+        self.border = RoundedRectangle(radius=[RADIUS])
+        self.card_color = Color(*CARD_COLOR)
+        self.card = RoundedRectangle(radius=[RADIUS])
+        self.text_color = Color(*OPEN_TEXT_COLOR)
+        self.ticket_text = Rectangle()
+        self.timer_heading = Rectangle(texture=render_text(TIMER_HEADING))
+        self.timer_digits = InstructionGroup()  # One atlas-region Rectangle per character of the elapsed time
+        self.order_color = Color(*ORDER_COLOR)
+        self.order_button = RoundedRectangle(radius=[RADIUS])
+        self.order_text_color = Color(*OPEN_TEXT_COLOR)
+        self.order_text = Rectangle(texture=render_text(ORDER_TEXT))
+        self.hand_off_color = Color(*HAND_OFF_COLOR)
+        self.hand_off_button = RoundedRectangle(radius=[RADIUS])
+        self.cancel_color = Color(*CANCEL_COLOR)
+        self.cancel_button = RoundedRectangle(radius=[RADIUS])
+        self.action_text_color = Color(1, 1, 1, 1)
+        self.hand_off_text = Rectangle(texture=render_text(HAND_OFF_TEXT))
+        self.cancel_text = Rectangle(texture=render_text(CANCEL_TEXT))
+
+        for instruction in (self.border_color, self.border, self.card_color, self.card,
+                            self.text_color, self.ticket_text, self.timer_heading, self.timer_digits,
+                            self.order_color, self.order_button, self.order_text_color, self.order_text,
+                            self.hand_off_color, self.hand_off_button, self.cancel_color, self.cancel_button,
+                            self.action_text_color, self.hand_off_text, self.cancel_text):
+            self.group.add(instruction)
+        self.canvas.add(self.group)
+
+        self.bind(pos=self.layout_row, size=self.layout_row, reveal=self.layout_row)
+
+    def refresh_view_attrs(self, rv, index, data):
+        """Rebind this row to the ticket at `index`."""
+        super().refresh_view_attrs(rv, index, data)
+        if self.ticket is not None and self.ticket.widget is self:
+            self.ticket.widget = None
+
+        self.ticket = self.panel.tickets.get(self.ticket_id) if self.panel else None
+        if self.ticket is not None:
+            self.ticket.widget = self
+
+        # Recycled rows must not carry another ticket's revealed actions or press
+        Animation.cancel_all(self, "reveal")
+        revealed = self.panel is not None and self.panel.swipe.is_revealed(self.ticket_id)
+        self.reveal = ACTIONS_WIDTH if revealed else 0
+        self.pressed = None
+        self.refresh()
+
+    def on_parent(self, instance, parent):
+        """Scrolled-off views are parked (and may come back for the same index); track who shows the ticket."""
+        if self.ticket is None:
+            return
+        if parent is None:
+            if self.ticket.widget is self:
+                self.ticket.widget = None
+        else:
+            self.ticket.widget = self
+
+    def layout_row(self, *args):
+        """Position every instruction from the row's size, pos and reveal width."""
+        x, y = self.pos
+        height = self.height
+        card_width = max(self.width - self.reveal, 0) * 0.99
+
+        self.border.pos, self.border.size = (x, y), (card_width, height)
+        self.card.pos, self.card.size = (x + 2, y + 2), (max(card_width - 4, 0), max(height - 4, 0))
+
+        # Inner row: ticket label, timer label, Order button (size hints 0.25 / 0.5 / 0.2)
+        inner_x, inner_y = x + 12, y + 12
+        inner_width, inner_height = max(card_width - 24, 0), max(height - 24, 0)
+        ticket_width = inner_width * 0.25 / 0.95
+        timer_width = inner_width * 0.5 / 0.95
+        order_width = inner_width * 0.2 / 0.95
+
+        self.regions["ticket_label"] = (inner_x, inner_y, ticket_width, inner_height)
+        self.regions["timer_label"] = (inner_x + ticket_width, inner_y, timer_width, inner_height)
+        self.regions["order"] = (inner_x + ticket_width + timer_width, inner_y, order_width, inner_height)
+        self.order_button.pos, self.order_button.size = self.regions["order"][:2], self.regions["order"][2:]
+
+        # Hidden actions slide in from the right edge
+        button_width, button_height = ACTION_BUTTON_SIZE
+        action_x = x + self.width - self.reveal + 10
+        action_y = y + (height - button_height) / 2
+        self.regions["hand_off"] = (action_x, action_y, button_width, button_height)
+        self.regions["cancel"] = (action_x + button_width + 10, action_y, button_width, button_height)
+        visible = (button_width, button_height) if self.reveal > 0 else (0, 0)
+        self.hand_off_button.pos, self.hand_off_button.size = self.regions["hand_off"][:2], visible
+        self.cancel_button.pos, self.cancel_button.size = self.regions["cancel"][:2], visible
+
+        self.place_text(self.ticket_text, "ticket_label")
+        self.place_timer()
+        self.place_text(self.order_text, "order")
+        self.place_text(self.hand_off_text, "hand_off", self.reveal > 0)
+        self.place_text(self.cancel_text, "cancel", self.reveal > 0)
+
+    def place_text(self, rect, region, visible=True):
+        """Center a text rectangle in a region."""
+        texture = rect.texture
+        if texture is None or not visible or region not in self.regions:
+            rect.size = (0, 0)
+            return
+        region_x, region_y, region_width, region_height = self.regions[region]
+        rect.size = texture.size
+        rect.pos = (int(region_x + (region_width - texture.width) / 2),
+                    int(region_y + (region_height - texture.height) / 2))
+
+    def place_timer(self):
+        """Stack the "Time:" heading over the elapsed digits, centered in the timer region."""
+        if "timer_label" not in self.regions or self.timer_text_value is None:
+            return
+        atlas = glyph_atlas()
+        region_x, region_y, region_width, region_height = self.regions["timer_label"]
+        heading_width, heading_height = self.timer_heading.texture.size
+        center_x = region_x + region_width / 2
+        top = region_y + (region_height + heading_height + atlas.height) / 2
+
+        self.timer_heading.size = (heading_width, heading_height)
+        self.timer_heading.pos = (int(center_x - heading_width / 2), int(top - heading_height))
+
+        text = self.timer_text_value
+        glyphs = atlas.layout(text, center_x - atlas.measure(text) / 2, top - heading_height - atlas.height)
+        for rect, (texture, pos, size) in zip(self.timer_rects, glyphs):
+            rect.texture, rect.pos, rect.size = texture, pos, size
+
+    def refresh(self):
+        """Redraw labels and button state from the bound ticket."""
+        ticket = self.ticket
+        if ticket is None:
+            return
+
+        if ticket.state == CANCELED:
+            ticket_text = "[b][u]Ticket:[/u][/b]\nCanceled"
+        elif ticket.handed_off_to:
+            status = "Sold" if ticket.state == SOLD else "Open"
+            ticket_text = f"[b][u]Handed Off:[/u][/b]\n[size=24]{ticket.handed_off_to} ({status})[/size]"
+        else:
+            ticket_text = "[b][u]Ticket[/u][/b]:\nSold" if ticket.state == SOLD else "[b][u]Ticket[/u][/b]:\nOpen"
+        if ticket_text != self.ticket_text_value:
+            self.ticket_text_value = ticket_text
+            self.ticket_text.texture = render_text(ticket_text, bold=True)
+            self.place_text(self.ticket_text, "ticket_label")
+
+        self.text_color.rgba = OPEN_TEXT_COLOR if ticket.running else CLOSED_TEXT_COLOR
+        self.update_button_colors()
+        self.update_timer()
+
+    def update_button_colors(self):
+        running = self.ticket is not None and self.ticket.running
+        if not running:
+            self.order_color.rgba = dull(ORDER_COLOR)
+            self.order_text_color.rgba = DISABLED_TEXT_COLOR
+        else:
+            self.order_color.rgba = darken(ORDER_COLOR) if self.pressed == "order" else ORDER_COLOR
+            self.order_text_color.rgba = OPEN_TEXT_COLOR
+        self.hand_off_color.rgba = darken(HAND_OFF_COLOR) if self.pressed == "hand_off" else HAND_OFF_COLOR
+        self.cancel_color.rgba = darken(CANCEL_COLOR) if self.pressed == "cancel" else CANCEL_COLOR
+
+    def update_timer(self):
+        """Show the running (or final) elapsed time."""
+        ticket = self.ticket
+        if ticket is None:
+            return
+        seconds = ticket.elapsed() if ticket.running else ticket.time_taken
+        timer_text = format_elapsed(seconds)
+        if timer_text != self.timer_text_value:
+            # Only swaps atlas regions on the per-character rectangles; nothing is re-rasterized
+            if self.timer_text_value is None or len(timer_text) != len(self.timer_text_value):
+                self.timer_digits.clear()
+                self.timer_rects = [Rectangle() for _ in timer_text]
+                for rect in self.timer_rects:
+                    self.timer_digits.add(rect)
+            self.timer_text_value = timer_text
+            self.place_timer()
+
+    def animate_actions(self, show):
+        """Slide the Hand Off / Cancel actions in or out; reveal state is kept by the panel's SwipeController."""
+        Animation.cancel_all(self, "reveal")
+        Animation(reveal=ACTIONS_WIDTH if show else 0, duration=0.2).start(self)
+
+    def region_at(self, pos):
+        """Return the enabled button under a point, if any."""
+        candidates = []
+        if self.ticket is not None and self.ticket.running:
+            candidates.append("order")
+            if self.reveal > 0:
+                candidates += ["hand_off", "cancel"]
+        for name in candidates:
+            region_x, region_y, region_width, region_height = self.regions.get(name, (0, 0, 0, 0))
+            if region_x <= pos[0] <= region_x + region_width and region_y <= pos[1] <= region_y + region_height:
+                return name
+        return None
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        region = self.region_at(touch.pos)
+        if region is None:
+            return False
+        self.pressed = region
+        touch.grab(self)
+        self.update_button_colors()
+        return True
+
+    def on_touch_up(self, touch):
+        if touch.grab_current is not self:
+            return False
+        touch.ungrab(self)
+        region, self.pressed = self.pressed, None
+        self.update_button_colors()
+        if touch.ud.get("swiped"):  # A swipe that started on a button isn't a press
+            return True
+        if region is not None and region == self.region_at(touch.pos):
+            if region == "order":
+                self.panel.order_out(self.ticket_id)
+            elif region == "hand_off":
+                self.panel.hand_off_ticket(self.ticket_id)
+            elif region == "cancel":
+                self.panel.cancel_ticket(self.ticket_id)
+        return True
@@ -0,0 +1,30 @@
+from kivy.clock import Clock
+
+
+class UpdateScheduler:
+    """Dirty-flag scheduler that coalesces UI updates into one pass per frame.
+
+    Callers mark named parts of a screen dirty instead of updating them on the
+    spot; a single Clock trigger then runs each dirty part's updater once,
+    just before the next frame is drawn, in the order the parts were registered.
+    Marking something twice in the same frame costs one set insert.
+    """
+
+    def __init__(self):
+        self._updaters = {}  # name -> updater, kept in registration (= pass) order
+        self._dirty = set()
+        self._trigger = Clock.create_trigger(self._flush, -1)  # -1: before the next frame
+
+    def register(self, name, updater):
+        self._updaters[name] = updater
+
+    def mark(self, *names):
+        """Flag parts for the next pass (one trigger, however many marks)."""
+        self._dirty.update(names)
+        self._trigger()
+
+    def _flush(self, *args):
+        dirty, self._dirty = self._dirty, set()
+        for name, updater in self._updaters.items():
+            if name in dirty:
+                updater()
@@ -1,7 +1,15 @@
 # widgets.py
 
+from bisect import bisect_right
 from kivy.uix.widget import Widget
 from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.properties import ListProperty, BooleanProperty
 from kivy.graphics import Color, Rectangle
 
 
@@ -18,3 +26,160 @@ class SeparatorLine(Widget):
         self.rect.size = self.size
         self.rect.pos = self.pos
 
+
+# RecycleView data helpers for StickyHeaderList
+def section_row(title):
+    return {"viewclass": "SectionHeaderRow", "text": f"[b]{title}[/b]", "height": 50}
+
+
+def grid_row(cells, is_header=False, color=(0.894, 0.898, 0.914, 1)):
+    # Every key is set on every row since recycled views keep their previous values
+    return {"viewclass": "GridRow", "cells": list(cells), "is_header": is_header,
+            "text_color": list(color), "height": 40}
+
+
+def message_row(text, color=(0.894, 0.898, 0.914, 1)):
+    return grid_row([text], color=color)
+
+
+# Row views shared by the history screens' RecycleViews
+class GridRow(RecycleDataViewBehavior, BoxLayout):
+    """One recycled table row: a horizontal strip of label cells on a flat background."""
+    cells = ListProperty()
+    is_header = BooleanProperty(False)
+    text_color = ListProperty([0.894, 0.898, 0.914, 1])
+    header_color = ListProperty([0.506, 0.522, 0.565, 1])
+    background_color = ListProperty([0.204, 0.408, 0.373, 1])
+
+    def __init__(self, **kwargs):
+        super().__init__(orientation="horizontal", padding=[20, 0, 20, 0], spacing=10, **kwargs)
+        self.cell_labels = []
+        with self.canvas.before:
+            self.bg_color = Color(*self.background_color)
+            self.rect = Rectangle(size=self.size, pos=self.pos)
+        self.bind(size=self.update_rect, pos=self.update_rect, background_color=self.update_rect,
+                  cells=self.update_cells, is_header=self.update_cells, text_color=self.update_cells)
+
+    def update_rect(self, *args):
+        self.bg_color.rgba = self.background_color
+        self.rect.size = self.size
+        self.rect.pos = self.pos
+
+    def update_cells(self, *args):
+        """Reuse the existing cell labels; only add/remove when the column count changes."""
+        while len(self.cell_labels) < len(self.cells):
+            label = Label()
+            self.cell_labels.append(label)
+            self.add_widget(label)
+        while len(self.cell_labels) > len(self.cells):
+            self.remove_widget(self.cell_labels.pop())
+
+        color = self.header_color if self.is_header else self.text_color
+        for label, text in zip(self.cell_labels, self.cells):
+            label.text = str(text)
+            label.bold = self.is_header
+            label.underline = self.is_header
+            label.color = color
+
+
+class SectionHeaderRow(RecycleDataViewBehavior, Label):
+    """Recycled day/period title row; also used as the pinned header of StickyHeaderList."""
+    background_color = ListProperty([0.204, 0.408, 0.373, 1])
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("bold", True)
+        kwargs.setdefault("underline", True)
+        kwargs.setdefault("markup", True)
+        kwargs.setdefault("color", (0.714, 0.569, 0.129, 1))
+        super().__init__(**kwargs)
+        with self.canvas.before:
+            self.bg_color = Color(*self.background_color)
+            self.rect = Rectangle(size=self.size, pos=self.pos)
+        self.bind(size=self.update_rect, pos=self.update_rect, background_color=self.update_rect)
+
+    def update_rect(self, *args):
+        self.bg_color.rgba = self.background_color
+        self.rect.size = self.size
+        self.rect.pos = self.pos
+
+
+class StickyHeaderList(FloatLayout):
+    """A RecycleView of GridRow/SectionHeaderRow items with the current section pinned on top.
+
+    Only the rows on screen are instantiated, so build time and memory stay flat
+    no matter how much history is loaded. Every data item must carry an explicit
+    `height`; section titles come from items whose viewclass is SectionHeaderRow.
+    """
+
+    def __init__(self, spacing=0, **kwargs):
+        super().__init__(**kwargs)
+        self.spacing = spacing
+        self.section_offsets = []  # Top offset (px from content top) of each section header
+        self.section_titles = []
+        self.content_height = 0
+
+        self.recycle_view = RecycleView(size_hint=(1, 1), pos_hint={"x": 0, "y": 0},
+                                        do_scroll_x=False, do_scroll_y=True)
+        layout = RecycleBoxLayout(orientation="vertical", size_hint=(1, None), spacing=spacing,
+                                  default_size=(None, 40), default_size_hint=(1, None))
+        layout.bind(minimum_height=layout.setter("height"))
+        self.recycle_view.add_widget(layout)
+        # viewclass lives on the layout manager, so it can only be set once the layout is added
+        self.recycle_view.viewclass = "GridRow"
+        self.recycle_view.key_viewclass = "viewclass"  # Each data item names its own row class
+        self.add_widget(self.recycle_view)
+
+        self.sticky_header = SectionHeaderRow(size_hint=(1, None), height=50, opacity=0,
+                                              pos_hint={"x": 0, "top": 1})
+        self.add_widget(self.sticky_header)
+
+        self.recycle_view.bind(scroll_y=self.update_sticky_header, height=self.update_sticky_header)
+
+    @property
+    def data(self):
+        return self.recycle_view.data
+
+    def set_data(self, items):
+        """Replace all rows and scroll back to the top."""
+        self.section_offsets = []
+        self.section_titles = []
+        self.content_height = 0
+        self.index_sections(items)
+        self.recycle_view.data = list(items)
+        self.recycle_view.scroll_y = 1
+        self.update_sticky_header()
+
+    def append_data(self, items):
+        """Append rows below the existing ones without moving what's on screen."""
+        viewport = self.recycle_view.height
+        scrollable = max(self.content_height - viewport, 0)
+        top_offset = (1 - self.recycle_view.scroll_y) * scrollable
+
+        self.index_sections(items)
+        self.recycle_view.data.extend(items)
+
+        scrollable = max(self.content_height - viewport, 0)
+        if scrollable:
+            self.recycle_view.scroll_y = 1 - min(top_offset / scrollable, 1)
+        self.update_sticky_header()
+
+    def index_sections(self, items):
+        for item in items:
+            if self.content_height:
+                self.content_height += self.spacing
+            if item.get("viewclass") == "SectionHeaderRow":
+                self.section_offsets.append(self.content_height)
+                self.section_titles.append(item.get("text", ""))
+            self.content_height += item["height"]
+
+    def update_sticky_header(self, *args):
+        """Pin the title of the section whose header has scrolled off the top."""
+        scrollable = max(self.content_height - self.recycle_view.height, 0)
+        top_offset = (1 - self.recycle_view.scroll_y) * scrollable
+        index = bisect_right(self.section_offsets, top_offset) - 1
+
+        if index >= 0 and top_offset > self.section_offsets[index]:
+            self.sticky_header.text = self.section_titles[index]
+            self.sticky_header.opacity = 1
+        else:
+            self.sticky_header.opacity = 0